@@ -0,0 +1,202 @@
+"""Headless batch evaluation of many input parameter sets.
+
+    python batch.py inputs.csv results.parquet --chunk-size 20000 --timings
+
+Reads parameter sets from CSV, JSON/JSON Lines or Parquet, evaluates every
+scenario for each row and streams the results to CSV or Parquet one chunk at
+a time. Only numpy and pandas are imported up front; pyarrow is imported when
+Parquet is read or written. Columns that are not model inputs are copied to
+the output to identify the rows, numeric ones as floats and the rest as text.
+
+--timings reports wall-clock time from process start, so interpreter startup
+and imports are included in the cold start; `python -X importtime batch.py
+...` breaks the import part down by module.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from engine import COLUMNS, INPUTS, SCENARIOS, evaluate_scenarios
+
+
+def process_seconds():
+    """Wall-clock seconds since this process started, or None without Linux /proc."""
+    try:
+        with open("/proc/self/stat") as f:
+            # starttime (field 22) is in clock ticks since boot; count after the command name, which may hold spaces
+            started = int(f.read().rpartition(")")[2].split()[19]) / os.sysconf("SC_CLK_TCK")
+        with open("/proc/uptime") as f:
+            return float(f.read().split()[0]) - started
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def import_pyarrow():
+    """pyarrow and pyarrow.parquet, with an actionable error when pyarrow is missing."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError("Parquet support needs pyarrow: pip install pyarrow") from error
+    return pa, pq
+
+
+def read_chunks(path, chunk_size):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        yield from pd.read_csv(path, chunksize=chunk_size)
+    elif extension == ".jsonl":
+        yield from pd.read_json(path, lines=True, chunksize=chunk_size)
+    elif extension == ".json":
+        frame = pd.read_json(path)
+        for start in range(0, len(frame), chunk_size):
+            yield frame.iloc[start:start + chunk_size]
+    elif extension == ".parquet":
+        _, pq = import_pyarrow()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported input format {extension!r}, expected .csv, .json, .jsonl or .parquet")
+
+
+def long_frame(chunk, scenarios, offset):
+    # One row per (input row, scenario), keyed by the input's position in the file
+    inputs = {name: chunk[name].to_numpy() for name in INPUTS if name in chunk}
+    results = evaluate_scenarios(inputs, scenarios)
+    n_rows, n_scenarios = len(chunk), len(scenarios)
+
+    frame = {"Input Row": np.repeat(np.arange(offset, offset + n_rows), n_scenarios)}
+    for name in chunk.columns:
+        if name not in INPUTS:
+            # A fixed type per kind, since readers infer dtypes chunk by chunk
+            column = chunk[name]
+            if pd.api.types.is_numeric_dtype(column):
+                column = column.astype("float64")
+            else:
+                column = column.astype("string")
+            frame[name] = np.repeat(column.to_numpy(), n_scenarios)
+    frame["Scenario"] = np.tile(results["Scenario"], n_rows)
+    frame["Description"] = np.tile(results["Description"], n_rows)
+    for column in COLUMNS[2:]:
+        frame[column] = results[column].ravel()
+    return pd.DataFrame(frame)
+
+
+class ResultWriter:
+    """Appends result chunks to a CSV or Parquet file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.extension = os.path.splitext(path)[1].lower()
+        if self.extension not in (".csv", ".parquet"):
+            raise ValueError(f"Unsupported output format {self.extension!r}, expected .csv or .parquet")
+        self._parquet = None
+        self._rows = 0
+        if self.extension == ".parquet":
+            # Fail before any input is read rather than after the first chunk
+            import_pyarrow()
+
+    def write(self, frame):
+        if self.extension == ".csv":
+            frame.to_csv(self.path, mode="w" if self._rows == 0 else "a", header=self._rows == 0, index=False)
+        else:
+            pa, pq = import_pyarrow()
+            if self._parquet is None:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            else:
+                frame = self._conform(frame, pa)
+                table = pa.Table.from_pandas(frame, schema=self._parquet.schema, preserve_index=False)
+            self._parquet.write_table(table)
+        self._rows += len(frame)
+
+    def _conform(self, frame, pa):
+        # Later chunks take the first chunk's column types, e.g. a text column that read as float because it was empty
+        frame = frame.copy()
+        for field in self._parquet.schema:
+            if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+                frame[field.name] = frame[field.name].astype("string")
+            elif pa.types.is_floating(field.type):
+                frame[field.name] = pd.to_numeric(frame[field.name])
+        return frame
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+        return self._rows
+
+
+def run(input_path, output_path, chunk_size=20000, scenarios=SCENARIOS):
+    """Evaluate every row of `input_path` and stream the results to `output_path`.
+
+    Returns the number of input rows, output rows and seconds spent
+    evaluating and writing.
+    """
+    writer = ResultWriter(output_path)
+    n_inputs = 0
+    evaluate_seconds = 0.0
+    write_seconds = 0.0
+    try:
+        for chunk in read_chunks(input_path, chunk_size):
+            started = time.perf_counter()
+            frame = long_frame(chunk, scenarios, n_inputs)
+            evaluated = time.perf_counter()
+            writer.write(frame)
+            evaluate_seconds += evaluated - started
+            write_seconds += time.perf_counter() - evaluated
+            n_inputs += len(chunk)
+    finally:
+        n_outputs = writer.close()
+    return {
+        "inputs": n_inputs,
+        "outputs": n_outputs,
+        "evaluate_seconds": evaluate_seconds,
+        "write_seconds": write_seconds,
+    }
+
+
+def main(argv=None):
+    startup = process_seconds()
+    started = time.perf_counter()
+    parser = argparse.ArgumentParser(description="Evaluate eSAF scenarios for many input parameter sets.")
+    parser.add_argument("input", help="CSV, JSON, JSON Lines or Parquet file with one parameter set per row")
+    parser.add_argument("output", help="CSV or Parquet file for the results")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="input rows evaluated per chunk")
+    parser.add_argument(
+        "--scenarios",
+        choices=["app", "generated"],
+        default="app",
+        help="the app's scenario table or all feasible generated combinations",
+    )
+    parser.add_argument("--timings", action="store_true", help="report startup, evaluate, write and total times on stderr")
+    args = parser.parse_args(argv)
+
+    if args.scenarios == "generated":
+        from scenarios import generate_scenarios
+
+        scenarios = tuple(generate_scenarios())
+    else:
+        scenarios = SCENARIOS
+
+    try:
+        summary = run(args.input, args.output, args.chunk_size, scenarios)
+    except ImportError as error:
+        parser.error(str(error))
+    if args.timings:
+        # Startup covers interpreter start and imports up to main(); without /proc only main() is timed
+        elapsed = time.perf_counter() - started
+        startup_text = f"{startup:.3f}s" if startup is not None else "n/a"
+        total = startup + elapsed if startup is not None else elapsed
+        print(
+            f"inputs={summary['inputs']} outputs={summary['outputs']} "
+            f"startup={startup_text} evaluate={summary['evaluate_seconds']:.3f}s "
+            f"write={summary['write_seconds']:.3f}s total={total:.3f}s",
+            file=sys.stderr,
+        )
+
+if __name__ == "__main__":
+    main()
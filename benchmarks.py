@@ -0,0 +1,163 @@
+"""Benchmarks for the model pipeline.
+
+    python benchmarks.py                       # run and compare against benchmark_baseline.json
+    python benchmarks.py --save                # run and record a new baseline unless it regressed
+    python benchmarks.py --only sweep --repeat 3
+
+Each case is timed `repeat` times; the median is compared with the baseline
+and the run exits with status 1 if any case is slower than `threshold` times
+its baseline. Cases whose optional dependencies are missing are skipped.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from breakeven import solve_thresholds
+from caching import IncrementalEvaluator
+from dcf import evaluate_dcf
+from engine import evaluate_scenarios, results_frame
+from scenarios import generate_scenarios
+
+SWEEP_SIZE = 100000
+DCF_GRID_SIZE = 10000
+
+
+def bench_single_evaluation():
+    evaluate_scenarios({})
+
+
+def bench_scenario_table():
+    results_frame(evaluate_scenarios({}))
+
+
+def bench_incremental_evaluation():
+    # Alternate one input so every call recomputes the scenarios that read it
+    evaluator = IncrementalEvaluator()
+    for i in range(100):
+        evaluator.evaluate({"water_price": float(i % 2)})
+
+
+def bench_generated_scenarios():
+    evaluate_scenarios({}, tuple(generate_scenarios()))
+
+
+def bench_sweep():
+    evaluate_scenarios({"electricity_price": np.linspace(10, 150, SWEEP_SIZE)})
+
+
+def bench_breakeven():
+    solve_thresholds({}, target_payback_days=1000)
+
+
+def bench_dcf_grid():
+    evaluate_dcf({"electricity_price": np.linspace(10, 150, DCF_GRID_SIZE)}, degradation=0.01)
+
+
+def bench_render_plot():
+    from plotting import profit_png
+
+    results = evaluate_scenarios({})
+    profit_png(tuple(results["Scenario"]), tuple(results["Profit (€)"][0]))
+
+
+BENCHMARKS = {
+    "single evaluation": bench_single_evaluation,
+    "scenario table": bench_scenario_table,
+    "incremental evaluation": bench_incremental_evaluation,
+    "generated scenarios": bench_generated_scenarios,
+    "sweep": bench_sweep,
+    "breakeven": bench_breakeven,
+    "dcf grid": bench_dcf_grid,
+    "render plot": bench_render_plot,
+}
+
+
+def run_benchmarks(names=None, repeat=5):
+    results = {}
+    for name in names or BENCHMARKS:
+        benchmark = BENCHMARKS[name]
+        try:
+            benchmark()  # warm-up, also surfaces missing optional dependencies
+        except ImportError as error:
+            results[name] = {"skipped": str(error)}
+            continue
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            benchmark()
+            times.append(time.perf_counter() - started)
+        results[name] = {"median_s": statistics.median(times), "min_s": min(times), "repeat": repeat}
+    return results
+
+
+def compare(results, baseline, threshold):
+    # Cases whose median is more than `threshold` times the baseline median
+    regressions = {}
+    for name, result in results.items():
+        previous = baseline.get(name, {})
+        if "median_s" in result and "median_s" in previous:
+            ratio = result["median_s"] / previous["median_s"]
+            if ratio > threshold:
+                regressions[name] = ratio
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the eSAF model pipeline.")
+    parser.add_argument("--baseline", default="benchmark_baseline.json", help="JSON file with baseline results")
+    parser.add_argument(
+        "--save", action="store_true", help="record this run's cases in the baseline, unless it has regressions"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio reported as a regression")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="cases to run")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.only, args.repeat)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, result in results.items():
+        if "skipped" in result:
+            print(f"{name:<24} skipped ({result['skipped']})")
+            continue
+        line = f"{name:<24} median {result['median_s'] * 1000:10.2f} ms   min {result['min_s'] * 1000:10.2f} ms"
+        if "median_s" in baseline.get(name, {}):
+            line += f"   x{result['median_s'] / baseline[name]['median_s']:.2f} vs baseline"
+        if name in regressions:
+            line += "   REGRESSION"
+        print(line)
+
+    if args.save and regressions:
+        # A slowdown is only accepted deliberately, by removing the baseline or raising --threshold
+        print(f"Baseline not saved: {len(regressions)} case(s) regressed against {args.baseline}", file=sys.stderr)
+    elif args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "pandas": pd.__version__,
+                    "machine": platform.machine(),
+                    # Cases left out with --only keep their previous baseline
+                    "results": {**baseline, **results},
+                },
+                f,
+                indent=2,
+            )
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
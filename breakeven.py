@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+
+from engine import INPUTS, SCENARIOS, evaluate_scenarios, input_columns
+
+# Profit is linear in each of these on its own: every cost and revenue line is a
+# product of two inputs, and CAPEX enters as capex / useful_life_years
+LINEAR_INPUTS = [name for name in INPUTS if name != "useful_life_years"]
+
+# Profit is linear in the reciprocal of these: CAPEX is spread as capex / useful_life_years
+RECIPROCAL_INPUTS = ["useful_life_years"]
+
+
+def linear_coefficients(inputs, parameters=None, scenarios=SCENARIOS):
+    """Intercept and slope of daily profit and total CAPEX in each parameter.
+
+    All parameters are extracted with a single engine call by evaluating each
+    one at 0 and at its own magnitude (1 where it is 0) with the other inputs
+    held fixed, so large inputs such as CAPEX keep their precision. Returns
+    {parameter: {"profit": (intercept, slope), "capex": (intercept, slope)}}
+    with (N, scenarios) arrays.
+    """
+    parameters = list(parameters or LINEAR_INPUTS)
+    nonlinear = set(parameters) - set(LINEAR_INPUTS)
+    if nonlinear:
+        raise ValueError(f"Profit is not linear in {sorted(nonlinear)}")
+
+    x = input_columns(inputs)
+    n = len(x[INPUTS[0]])
+    stacked = {name: np.tile(column, 2 * len(parameters)) for name, column in x.items()}
+    steps = {name: np.where(x[name] != 0, np.abs(x[name]), 1.0) for name in parameters}
+    for i, name in enumerate(parameters):
+        stacked[name][2 * i * n:(2 * i + 1) * n] = 0.0
+        stacked[name][(2 * i + 1) * n:(2 * i + 2) * n] = steps[name]
+
+    results = evaluate_scenarios(stacked, scenarios)
+    shape = (len(parameters), 2, n, -1)
+    profit = results["Profit (€)"].reshape(shape)
+    capex = (results["Annualized CAPEX (€)"] * stacked["useful_life_years"][:, None]).reshape(shape)
+    return {
+        name: {
+            "profit": (profit[i, 0], (profit[i, 1] - profit[i, 0]) / steps[name][:, None]),
+            "capex": (capex[i, 0], (capex[i, 1] - capex[i, 0]) / steps[name][:, None]),
+        }
+        for i, name in enumerate(parameters)
+    }
+
+
+def reciprocal_coefficients(inputs, parameters=None, scenarios=SCENARIOS):
+    """Intercept and slope of daily profit in 1 / parameter, and total CAPEX.
+
+    Each parameter is evaluated at 1 and 2 with the other inputs held fixed,
+    all in a single engine call. Returns
+    {parameter: {"profit": (intercept, slope), "capex": total}} with
+    (N, scenarios) arrays; total CAPEX does not depend on these parameters.
+    """
+    parameters = list(parameters or RECIPROCAL_INPUTS)
+    unsupported = set(parameters) - set(RECIPROCAL_INPUTS)
+    if unsupported:
+        raise ValueError(f"Profit is not linear in the reciprocal of {sorted(unsupported)}")
+
+    x = input_columns(inputs)
+    n = len(x[INPUTS[0]])
+    stacked = {name: np.tile(column, 2 * len(parameters)) for name, column in x.items()}
+    for i, name in enumerate(parameters):
+        stacked[name][2 * i * n:(2 * i + 1) * n] = 1.0
+        stacked[name][(2 * i + 1) * n:(2 * i + 2) * n] = 2.0
+
+    results = evaluate_scenarios(stacked, scenarios)
+    shape = (len(parameters), 2, n, -1)
+    profit = results["Profit (€)"].reshape(shape)
+    capex = (results["Annualized CAPEX (€)"] * stacked["useful_life_years"][:, None]).reshape(shape)
+    # 1 / parameter goes from 1 to 0.5
+    slope = (profit[:, 0] - profit[:, 1]) / 0.5
+    return {
+        name: {"profit": (profit[i, 0] - slope[i], slope[i]), "capex": capex[i, 0]}
+        for i, name in enumerate(parameters)
+    }
+
+
+def solve_thresholds(inputs=None, parameters=None, target_payback_days=None, scenarios=SCENARIOS):
+    """Breakeven and target-payback values of each parameter for every scenario.
+
+    Every parameter is solved in closed form: linear ones from
+    linear_coefficients, useful_life_years from reciprocal_coefficients.
+    Returns {parameter: {"Breakeven": array, "Target Payback": array}} with
+    (N, scenarios) arrays; "Target Payback" is only present when
+    `target_payback_days` is given. NaN marks cells where the parameter
+    does not move profit, the scenario has no CAPEX to pay back, or the
+    solution is not a positive useful life.
+    """
+    inputs = inputs or {}
+    parameters = list(parameters or INPUTS)
+    linear = [name for name in parameters if name in LINEAR_INPUTS]
+    reciprocal = [name for name in parameters if name in RECIPROCAL_INPUTS]
+    coefficients = linear_coefficients(inputs, linear, scenarios) if linear else {}
+    reciprocals = reciprocal_coefficients(inputs, reciprocal, scenarios) if reciprocal else {}
+
+    solution = {}
+    for name in parameters:
+        if name in coefficients:
+            a, b = coefficients[name]["profit"]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                thresholds = {"Breakeven": np.where(b != 0, -a / b, np.nan)}
+                if target_payback_days is not None:
+                    # Solve a + b * p = (k + c * p) / target; CAPEX items move both sides
+                    k, c = coefficients[name]["capex"]
+                    slope = b - c / target_payback_days
+                    value = (k / target_payback_days - a) / slope
+                    # Without positive CAPEX at the solution, payback is 0 or infinite, never the target
+                    thresholds["Target Payback"] = np.where((slope != 0) & (k + c * value > 0), value, np.nan)
+        else:
+            # Solve a + b / p = 0 and a + b / p = k / target for 1 / p, which must be positive
+            a, b = reciprocals[name]["profit"]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                inverse = -a / b
+                thresholds = {"Breakeven": np.where((b != 0) & (inverse > 0), 1 / inverse, np.nan)}
+                if target_payback_days is not None:
+                    k = reciprocals[name]["capex"]
+                    inverse = (k / target_payback_days - a) / b
+                    thresholds["Target Payback"] = np.where((b != 0) & (k > 0) & (inverse > 0), 1 / inverse, np.nan)
+        solution[name] = thresholds
+    return solution
+
+
+def thresholds_frame(solution, scenarios=SCENARIOS, row=0):
+    # One input vector's thresholds with a row per scenario and a column per parameter and kind
+    frame = {"Scenario": [scenario for scenario, _, _, _ in scenarios]}
+    for name, thresholds in solution.items():
+        for kind, values in thresholds.items():
+            frame[f"{name} ({kind})"] = values[row]
+    return pd.DataFrame(frame)
@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from engine import COLUMNS, DEFAULT_INPUTS, INPUTS, SCENARIOS, evaluate_scenarios, scenario_dependencies
+
+
+class LRUCache:
+    """Thread-safe mapping that evicts the least recently used entry beyond `maxsize`."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def normalize_inputs(inputs):
+    # Scalar inputs with defaults filled in, as floats so 10 and 10.0 share cache entries
+    unknown = set(inputs) - set(INPUTS)
+    if unknown:
+        raise ValueError(f"Unknown inputs: {sorted(unknown)}")
+    merged = {**DEFAULT_INPUTS, **inputs}
+    return {name: float(merged[name]) for name in INPUTS}
+
+
+class IncrementalEvaluator:
+    """Evaluates scenarios for one input set, recomputing only those whose inputs changed.
+
+    Each scenario's result row is cached under the values of the inputs it
+    reads (see engine.scenario_dependencies), so changing e.g. water_price
+    only recomputes scenarios that involve water.
+    """
+
+    def __init__(self, scenarios=SCENARIOS, maxsize=4096):
+        self.scenarios = tuple(scenarios)
+        self.dependencies = [sorted(names) for names in scenario_dependencies(self.scenarios)]
+        self.cache = LRUCache(maxsize)
+        self.recomputed = 0
+
+    def evaluate(self, inputs):
+        """Same result layout as engine.evaluate_scenarios for a single input vector."""
+        inputs = normalize_inputs(inputs)
+        keys = [
+            (scenario[0], tuple(inputs[name] for name in names))
+            for scenario, names in zip(self.scenarios, self.dependencies)
+        ]
+        rows = [self.cache.get(key) for key in keys]
+
+        missing = [i for i, row in enumerate(rows) if row is None]
+        if missing:
+            results = evaluate_scenarios(inputs, [self.scenarios[i] for i in missing])
+            for j, i in enumerate(missing):
+                rows[i] = {column: results[column][0, j] for column in COLUMNS[2:]}
+                self.cache.put(keys[i], rows[i])
+        self.recomputed = len(missing)
+
+        return {
+            "Scenario": np.array([scenario for scenario, _, _, _ in self.scenarios], dtype=object),
+            "Description": np.array([description for _, _, description, _ in self.scenarios], dtype=object),
+            **{column: np.array([[row[column] for row in rows]]) for column in COLUMNS[2:]},
+        }
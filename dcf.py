@@ -0,0 +1,147 @@
+import numpy as np
+
+from engine import PROFIT_FREQUENCY_ANNUALLY, SCENARIOS, evaluate_scenarios, input_columns
+
+
+def cash_flows(
+    inputs,
+    degradation=0.0,
+    opex_escalation=0.0,
+    capex_phasing=(1.0,),
+    scenarios=SCENARIOS,
+    operating_days=PROFIT_FREQUENCY_ANNUALLY,
+):
+    """Yearly cash flows of every scenario as an (N, scenarios, years + 1) array.
+
+    Year 0 onwards carries CAPEX, split by `capex_phasing` fractions; years 1
+    to useful_life_years carry operating profit (revenue minus operating
+    costs, CAPEX excluded) over `operating_days`. Output degrades by
+    `degradation` a year and operating costs escalate by `opex_escalation`
+    a year. degradation and opex_escalation may be scalars or (N,) arrays.
+    """
+    x = input_columns(inputs)
+    results = evaluate_scenarios(inputs, scenarios)
+    life = x["useful_life_years"][:, None, None]
+    annualized_capex = results["Annualized CAPEX (€)"]
+    total_capex = annualized_capex * x["useful_life_years"][:, None]
+    revenue = results["Revenue (€)"] * operating_days
+    operating_cost = (results["Total Production Cost (€)"] - annualized_capex / PROFIT_FREQUENCY_ANNUALLY) * operating_days
+
+    years = max(int(np.ceil(life.max())), len(capex_phasing) - 1)
+    t = np.arange(years + 1)
+    degradation = np.broadcast_to(np.asarray(degradation, dtype=float), life.shape[:1])[:, None, None]
+    opex_escalation = np.broadcast_to(np.asarray(opex_escalation, dtype=float), life.shape[:1])[:, None, None]
+
+    # Share of each year the assets operate: none in year 0, a partial final year for fractional lives
+    operating = np.clip(life - (t - 1), 0, 1) * (t > 0)
+    output = (1 - degradation) ** np.maximum(t - 1, 0)
+    escalation = (1 + opex_escalation) ** np.maximum(t - 1, 0)
+    flows = operating * output * (revenue[..., None] - operating_cost[..., None] * escalation)
+
+    phasing = np.zeros(years + 1)
+    phasing[:len(capex_phasing)] = capex_phasing
+    return flows - total_capex[..., None] * phasing
+
+
+def _npv_and_derivative(flows, rate):
+    # Horner's scheme in v = 1 / (1 + rate), so no (..., years) power arrays are built
+    v = 1 / (1 + rate)
+    value = np.zeros(np.broadcast_shapes(flows.shape[:-1], np.shape(rate)))
+    slope = np.zeros_like(value)
+    for year in range(flows.shape[-1] - 1, -1, -1):
+        slope = slope * v + value
+        value = value * v + flows[..., year]
+    # dv / drate = -v ** 2
+    return value, -slope * v ** 2
+
+
+def npv(flows, rate):
+    """Net present value of (..., years + 1) cash flows; `rate` broadcasts against the leading axes."""
+    return _npv_and_derivative(flows, np.asarray(rate, dtype=float))[0]
+
+
+def irr(flows, lo=-0.99, hi=10.0, tol=1e-10, max_iterations=100):
+    """Internal rate of return of every cash flow series at once.
+
+    Newton steps are taken for all unconverged cells simultaneously and
+    replaced by bisection wherever they leave the bracket, which shrinks each
+    iteration. Cells whose NPV does not change sign over [lo, hi] are NaN.
+    """
+    shape = flows.shape[:-1]
+    flows = flows.reshape(-1, flows.shape[-1])
+    lo = np.full(len(flows), lo, dtype=float)
+    hi = np.full(len(flows), hi, dtype=float)
+    npv_lo = npv(flows, lo)
+    valid = np.sign(npv_lo) != np.sign(npv(flows, hi))
+
+    result = np.full(len(flows), np.nan)
+    active = np.flatnonzero(valid)
+    lo, hi, npv_lo = lo[active], hi[active], npv_lo[active]
+    rate = (lo + hi) / 2
+    for _ in range(max_iterations):
+        if not len(active):
+            break
+        value, derivative = _npv_and_derivative(flows[active], rate)
+
+        # Keep the root bracketed
+        same_side = np.sign(value) == np.sign(npv_lo)
+        lo = np.where(same_side, rate, lo)
+        npv_lo = np.where(same_side, value, npv_lo)
+        hi = np.where(same_side, hi, rate)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = rate - value / derivative
+        inside = np.isfinite(newton) & (newton > lo) & (newton < hi)
+        step = np.where(inside, newton, (lo + hi) / 2)
+
+        # Only unconverged cells are carried into the next iteration
+        converged = (np.abs(step - rate) < tol) | (value == 0)
+        result[active] = step
+        keep = ~converged
+        active, lo, hi, npv_lo, rate = active[keep], lo[keep], hi[keep], npv_lo[keep], step[keep]
+    return result.reshape(shape)
+
+
+def discounted_payback(flows, rate):
+    """Years until cumulative discounted cash flow turns non-negative for good, interpolated within the year.
+
+    Years before a later CAPEX outflow (e.g. a zero year 0 under phased
+    CAPEX) do not count. Infinite where the investment is never recovered.
+    """
+    factors = (1 + np.asarray(rate, dtype=float)[..., None]) ** -np.arange(flows.shape[-1])
+    cumulative = np.cumsum(flows * factors, axis=-1)
+    # Recovered from this year to the end of the horizon
+    recovered = np.flip(np.logical_and.accumulate(np.flip(cumulative >= 0, axis=-1), axis=-1), axis=-1)
+    year = np.argmax(recovered, axis=-1)
+    never = ~recovered.any(axis=-1)
+
+    previous = np.take_along_axis(cumulative, np.maximum(year - 1, 0)[..., None], axis=-1)[..., 0]
+    current = np.take_along_axis(cumulative, year[..., None], axis=-1)[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(year > 0, -previous / (current - previous), 0.0)
+    return np.where(never, np.inf, np.maximum(year - 1, 0) + fraction * (year > 0))
+
+
+def evaluate_dcf(
+    inputs,
+    discount_rate=0.08,
+    degradation=0.0,
+    opex_escalation=0.0,
+    capex_phasing=(1.0,),
+    scenarios=SCENARIOS,
+):
+    """NPV, IRR and discounted payback of every scenario for N input vectors.
+
+    discount_rate, degradation and opex_escalation may be scalars or (N,)
+    arrays, so a sensitivity grid is one call with each axis flattened into
+    the input vectors. Returns a dict with "Scenario" and (N, scenarios)
+    arrays.
+    """
+    flows = cash_flows(inputs, degradation, opex_escalation, capex_phasing, scenarios)
+    rate = np.broadcast_to(np.asarray(discount_rate, dtype=float), flows.shape[:1])[:, None]
+    return {
+        "Scenario": np.array([scenario for scenario, _, _, _ in scenarios], dtype=object),
+        "NPV (€)": npv(flows, rate),
+        "IRR": irr(flows),
+        "Discounted Payback (years)": discounted_payback(flows, rate),
+    }
@@ -0,0 +1,251 @@
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+
+# Per-unit operating parameters, in the order used by the scenario value vectors
+PARAMETERS = [
+    "electricity_price",
+    "electrolysis_ratio",
+    "hydrogen_price",
+    "hydrogen_quantity",
+    "fractionation_ratio",
+    "co2_price",
+    "co2_quantity",
+    "water_price",
+    "water_quantity",
+    "esaf_selling_price",
+]
+
+CAPEX_ITEMS = ["electrolysis", "hydrogen_storage", "co2_capture", "esaf_production"]
+
+INPUTS = PARAMETERS + ["capex_" + item for item in CAPEX_ITEMS] + ["useful_life_years"]
+
+# Same defaults as the Streamlit inputs in financial_model.py
+DEFAULT_INPUTS = {
+    "electricity_price": 50.0,
+    "electrolysis_ratio": 27.5,
+    "hydrogen_price": 6.0,
+    "hydrogen_quantity": 250.0,
+    "fractionation_ratio": 12.5,
+    "co2_price": 500.0,
+    "co2_quantity": 1.8,
+    "water_price": 0.0,
+    "water_quantity": 7.0,
+    "esaf_selling_price": 2750.0,
+    "capex_electrolysis": 1000000,
+    "capex_hydrogen_storage": 500000,
+    "capex_co2_capture": 800000,
+    "capex_esaf_production": 2000000,
+    "useful_life_years": 10,
+}
+
+COMPONENTS = ["E", "W", "EP", "H", "CO2", "C"]
+
+# Additive (LINES x TERMS) coefficients of components registered beyond the built-in ones
+EXTRA_COMPONENTS = {}
+
+PROFIT_FREQUENCY_ANNUALLY = 365
+
+# (scenario, parameters used (1) or zeroed (0), description, CAPEX items)
+SCENARIOS = (
+    ("E", (1, 1, 0, 0, 1, 0, 0, 0, 0, 0), "Supplying only electricity", ()),
+    ("W", (0, 0, 0, 0, 0, 0, 0, 1, 1, 0), "Supplying only water for electrolysis", ()),
+    ("EP", (1, 1, 1, 1, 0, 0, 0, 1, 1, 0), "Producing hydrogen through electrolysis", ("electrolysis", "hydrogen_storage")),
+    ("CO2", (0, 0, 0, 0, 0, 1, 1, 0, 0, 0), "Acquiring and selling CO2", ("co2_capture",)),
+    ("C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Converting hydrogen and CO2 to eSAF", ("esaf_production",)),
+    ("E + W", (1, 1, 0, 0, 0, 0, 0, 1, 1, 0), "Supplying electricity and water for electrolysis", ()),
+    ("E + EP", (1, 1, 1, 1, 0, 0, 0, 1, 1, 0), "Supplying electricity and producing hydrogen", ("electrolysis", "hydrogen_storage")),
+    ("E + CO2", (1, 1, 0, 0, 0, 1, 1, 0, 0, 0), "Supplying electricity and acquiring CO2", ("co2_capture",)),
+    ("E + C", (1, 1, 0, 0, 1, 1, 1, 1, 1, 1), "Supplying electricity and converting to eSAF", ("esaf_production",)),
+    ("W + EP", (1, 1, 1, 1, 0, 0, 0, 1, 1, 0), "Supplying water and producing hydrogen", ("electrolysis", "hydrogen_storage")),
+    ("W + CO2", (1, 1, 0, 0, 0, 1, 1, 1, 1, 0), "Supplying water and acquiring CO2", ("co2_capture",)),
+    ("W + C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Supplying water and converting to eSAF", ("esaf_production",)),
+    ("EP + CO2", (1, 1, 1, 1, 0, 1, 1, 1, 1, 0), "Producing hydrogen and acquiring CO2", ("electrolysis", "hydrogen_storage", "co2_capture")),
+    ("EP + C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Producing hydrogen and converting to eSAF", ("electrolysis", "hydrogen_storage", "esaf_production")),
+    ("CO2 + C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Acquiring CO2 and converting to eSAF", ("co2_capture", "esaf_production")),
+    ("E + W + EP", (1, 1, 1, 1, 0, 0, 0, 1, 1, 0), "Supplying electricity, water, and producing hydrogen", ("electrolysis", "hydrogen_storage")),
+    ("E + W + CO2", (1, 1, 0, 0, 0, 1, 1, 1, 1, 0), "Supplying electricity, water, and acquiring CO2", ("co2_capture",)),
+    ("E + W + C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Supplying electricity, water, and converting to eSAF", ("esaf_production",)),
+    ("E + EP + CO2", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Supplying electricity, producing hydrogen, and acquiring CO2", ("electrolysis", "hydrogen_storage", "co2_capture")),
+    ("E + EP + C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Supplying electricity, producing hydrogen, and converting to eSAF", ("electrolysis", "hydrogen_storage", "esaf_production")),
+    ("E + CO2 + C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Supplying electricity, acquiring CO2, and converting to eSAF", ("co2_capture", "esaf_production")),
+    ("W + EP + CO2", (1, 1, 1, 1, 0, 1, 1, 1, 1, 1), "Supplying water, producing hydrogen, and acquiring CO2", ("electrolysis", "hydrogen_storage", "co2_capture")),
+    ("W + EP + C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Supplying water, producing hydrogen, and converting to eSAF", ("electrolysis", "hydrogen_storage", "esaf_production")),
+    ("W + CO2 + C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Supplying water, acquiring CO2, and converting to eSAF", ("co2_capture", "esaf_production")),
+    ("EP + CO2 + C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Producing hydrogen, acquiring CO2, and converting to eSAF", ("electrolysis", "hydrogen_storage", "co2_capture", "esaf_production")),
+    ("H + CO2 + C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Handling hydrogen, acquiring CO2, and converting to eSAF", ("co2_capture", "esaf_production")),
+    ("E + W + EP + CO2", (1, 1, 1, 1, 0, 1, 1, 1, 1, 1), "Supplying electricity, water, producing hydrogen, and acquiring CO2", ("electrolysis", "hydrogen_storage")),
+    ("E + W + EP + C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Supplying electricity, water, producing hydrogen, and converting to eSAF", ("electrolysis", "hydrogen_storage", "esaf_production")),
+    ("E + W + CO2 + C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Supplying electricity, water, acquiring CO2, and converting to eSAF", ("co2_capture", "esaf_production")),
+    ("E + EP + CO2 + C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Supplying electricity, producing hydrogen, acquiring CO2, and converting to eSAF", ("electrolysis", "hydrogen_storage", "co2_capture", "esaf_production")),
+    ("W + EP + CO2 + C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Supplying water, producing hydrogen, acquiring CO2, and converting to eSAF", ("electrolysis", "hydrogen_storage", "co2_capture", "esaf_production")),
+    ("E + W + EP + CO2 + C", (1, 1, 1, 1, 1, 1, 1, 1, 1, 1), "Supplying electricity, water, producing hydrogen, acquiring CO2, and converting to eSAF", ("electrolysis", "hydrogen_storage", "co2_capture", "esaf_production")),
+)
+
+# Price x quantity products that every cost and revenue line is built from
+TERMS = [
+    ("electricity_price", "electrolysis_ratio"),
+    ("electricity_price", "fractionation_ratio"),
+    ("water_price", "water_quantity"),
+    ("hydrogen_price", "hydrogen_quantity"),
+    ("co2_price", "co2_quantity"),
+    ("esaf_selling_price", None),
+]
+
+LINES = ["Electricity Cost (€)", "Hydrogen Cost (€)", "CO2 Cost (€)", "Water Cost (€)", "Revenue (€)"]
+
+COLUMNS = [
+    "Scenario",
+    "Description",
+    "Electricity Cost (€)",
+    "Hydrogen Cost (€)",
+    "CO2 Cost (€)",
+    "Water Cost (€)",
+    "Annualized CAPEX (€)",
+    "Total Production Cost (€)",
+    "Revenue (€)",
+    "Profit (€)",
+    "Payback Period (days)",
+]
+
+
+def parse_scenario(scenario):
+    components = {part.strip() for part in scenario.split("+")}
+    known = COMPONENTS + list(EXTRA_COMPONENTS)
+    unknown = components - set(known)
+    if unknown:
+        raise ValueError(f"Unknown components in scenario {scenario!r}: {sorted(unknown)}")
+    return {component: component in components for component in known}
+
+
+def scenario_coefficients(scenario):
+    # How often each of TERMS enters each line of LINES for this scenario
+    flags = parse_scenario(scenario)
+    E, W, EP, CO2, C = flags["E"], flags["W"], flags["EP"], flags["CO2"], flags["C"]
+
+    electricity = [EP, (E and EP and not C) + C, 0, 0, 0, 0]
+    hydrogen = [0, 0, 0, C and not EP, 0, 0]
+    co2 = [0, 0, 0, 0, C, 0]
+    # Water is charged twice when electrolysing without supplying water ourselves
+    water = [0, 0, EP + (EP and not W), 0, 0, 0]
+    revenue = [
+        (E and not C) + (E and not C and not EP),
+        0,
+        W and not EP,
+        EP and not C,
+        CO2 and not C,
+        C,
+    ]
+    coefficients = np.array([electricity, hydrogen, co2, water, revenue], dtype=float)
+    for component, extra in EXTRA_COMPONENTS.items():
+        if flags[component]:
+            coefficients += extra
+    return coefficients
+
+
+@lru_cache(maxsize=32)
+def compile_scenarios(scenarios):
+    names = [scenario for scenario, _, _, _ in scenarios]
+    descriptions = [description for _, _, description, _ in scenarios]
+
+    coefficients = np.empty((len(LINES), len(scenarios), len(TERMS)))
+    capex = np.zeros((len(scenarios), len(CAPEX_ITEMS)))
+    for i, (scenario, mask, _, capex_items) in enumerate(scenarios):
+        used = dict(zip(PARAMETERS, mask))
+        # A term only contributes when neither of its factors is zeroed out
+        term_mask = [used[price] and (quantity is None or used[quantity]) for price, quantity in TERMS]
+        coefficients[:, i, :] = scenario_coefficients(scenario) * np.array(term_mask, dtype=float)
+        for item in capex_items:
+            capex[i, CAPEX_ITEMS.index(item)] = 1
+
+    return {
+        "names": np.array(names, dtype=object),
+        "descriptions": np.array(descriptions, dtype=object),
+        "coefficients": coefficients,
+        "capex": capex,
+    }
+
+
+def scenario_dependencies(scenarios=SCENARIOS):
+    # Inputs each scenario actually reads, so cached results can be reused when others change
+    compiled = compile_scenarios(tuple(scenarios))
+    dependencies = []
+    for i, (_, _, _, capex_items) in enumerate(scenarios):
+        used = set()
+        for k, (price, quantity) in enumerate(TERMS):
+            if compiled["coefficients"][:, i, k].any():
+                used.update(name for name in (price, quantity) if name is not None)
+        if capex_items:
+            used.update("capex_" + item for item in capex_items)
+            used.add("useful_life_years")
+        dependencies.append(frozenset(used))
+    return dependencies
+
+
+def input_columns(inputs):
+    # Broadcast scalars and 1-D arrays to N input vectors, filling gaps from DEFAULT_INPUTS
+    unknown = set(inputs) - set(INPUTS)
+    if unknown:
+        raise ValueError(f"Unknown inputs: {sorted(unknown)}")
+    merged = {**DEFAULT_INPUTS, **inputs}
+    columns = np.broadcast_arrays(*(np.atleast_1d(np.asarray(merged[name], dtype=float)) for name in INPUTS))
+    return dict(zip(INPUTS, columns))
+
+
+def evaluate_scenarios(inputs, scenarios=SCENARIOS, profit_frequency_annually=PROFIT_FREQUENCY_ANNUALLY):
+    """Evaluate every scenario against N input vectors in one pass.
+
+    Costs and revenue are per period, with annualized CAPEX spread over
+    `profit_frequency_annually` periods (days by default). Returns a dict
+    keyed like the results table: "Scenario" and "Description" hold one
+    entry per scenario, every other column is an (N, scenarios) array.
+    """
+    compiled = compile_scenarios(tuple(scenarios))
+    x = input_columns(inputs)
+
+    terms = np.stack(
+        [x[price] if quantity is None else x[price] * x[quantity] for price, quantity in TERMS],
+        axis=1,
+    )
+    lines = {line: terms @ coefficients.T for line, coefficients in zip(LINES, compiled["coefficients"])}
+
+    useful_life_years = x["useful_life_years"][:, None]
+    # Items a scenario doesn't own are skipped rather than multiplied by zero, so a zero
+    # useful life (infinite annualized CAPEX) cannot turn CAPEX-free scenarios into NaN
+    annualized_capex = np.zeros((len(useful_life_years), len(compiled["names"])))
+    with np.errstate(divide="ignore"):
+        for j, item in enumerate(CAPEX_ITEMS):
+            owned = compiled["capex"][:, j] > 0
+            annualized_capex[:, owned] += x["capex_" + item][:, None] / useful_life_years
+
+    total_production_cost = (
+        lines["Electricity Cost (€)"]
+        + lines["Hydrogen Cost (€)"]
+        + lines["CO2 Cost (€)"]
+        + lines["Water Cost (€)"]
+        + annualized_capex / profit_frequency_annually
+    )
+    profit = lines["Revenue (€)"] - total_production_cost
+
+    # Infinite if daily profit is zero or negative
+    payback_period = np.full(profit.shape, np.inf)
+    with np.errstate(invalid="ignore"):
+        np.divide(annualized_capex * useful_life_years, profit, out=payback_period, where=profit > 0)
+
+    return {
+        "Scenario": compiled["names"],
+        "Description": compiled["descriptions"],
+        **{line: lines[line] for line in LINES[:4]},
+        "Annualized CAPEX (€)": annualized_capex,
+        "Total Production Cost (€)": total_production_cost,
+        "Revenue (€)": lines["Revenue (€)"],
+        "Profit (€)": profit,
+        "Payback Period (days)": payback_period,
+    }
+
+
+def results_frame(results, row=0):
+    # One input vector's results in the layout of the Streamlit results table
+    return pd.DataFrame(
+        {column: results[column] if column in ("Scenario", "Description") else results[column][row] for column in COLUMNS}
+    )
@@ -0,0 +1,212 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from engine import INPUTS, SCENARIOS, evaluate_scenarios
+
+HOURS_PER_YEAR = 8760
+
+
+def _csv_rows(path):
+    with open(path, "rb") as f:
+        return sum(1 for line in f if line.strip()) - 1
+
+
+def _numeric_columns(frame):
+    return [column for column in frame.columns if pd.api.types.is_numeric_dtype(frame[column])]
+
+
+def _default_columns(source):
+    # Numeric columns of a CSV or Parquet price curve, from a sample of rows or the schema
+    extension = os.path.splitext(source)[1].lower()
+    if extension == ".csv":
+        return _numeric_columns(pd.read_csv(source, nrows=1000))
+    if extension == ".parquet":
+        from batch import import_pyarrow
+
+        _, pq = import_pyarrow()
+        return _numeric_columns(pq.ParquetFile(source).schema_arrow.empty_table().to_pandas())
+    raise ValueError(f"Unsupported price curve format {extension!r}, expected .npy, .csv or .parquet")
+
+
+def build_cache(source, cache_path, columns=None, chunk_rows=100000):
+    """Convert a CSV or Parquet price curve to a .npy file, one column per region.
+
+    `columns` selects the value columns; by default every numeric column is
+    used, so timestamp or label columns are skipped. The source is streamed
+    in chunks into a memory-mapped output, so the curve never has to fit in
+    RAM. The column names are stored next to the cache and returned.
+    """
+    if columns is None:
+        columns = _default_columns(source)
+    extension = os.path.splitext(source)[1].lower()
+    if extension == ".csv":
+        rows = _csv_rows(source)
+        chunks = (
+            chunk[columns].to_numpy(dtype=float)
+            for chunk in pd.read_csv(source, usecols=columns, chunksize=chunk_rows)
+        )
+    elif extension == ".parquet":
+        from batch import import_pyarrow
+
+        _, pq = import_pyarrow()
+        parquet = pq.ParquetFile(source)
+        rows = parquet.metadata.num_rows
+        chunks = (
+            batch.to_pandas()[columns].to_numpy(dtype=float)
+            for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns)
+        )
+    else:
+        raise ValueError(f"Unsupported price curve format {extension!r}, expected .npy, .csv or .parquet")
+    columns = list(columns)
+    if not columns:
+        raise ValueError(f"No numeric price columns in {source}")
+
+    temporary = cache_path + ".tmp"
+    try:
+        out = np.lib.format.open_memmap(temporary, mode="w+", dtype=np.float64, shape=(rows, len(columns)))
+        start = 0
+        for chunk in chunks:
+            out[start:start + len(chunk)] = chunk
+            start += len(chunk)
+        out.flush()
+        del out
+        os.replace(temporary, cache_path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+    with open(cache_path + ".columns.json", "w") as f:
+        json.dump(columns, f)
+    return columns
+
+
+def _regions(npy_path, curve):
+    # Column names stored by build_cache, or positions for curves saved without them
+    try:
+        with open(npy_path + ".columns.json") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return list(range(curve.shape[1])) if curve.ndim == 2 else [0]
+
+
+def load_curve(path, columns=None):
+    """Memory-map an hourly price curve of shape (hours,) or (hours, regions).
+
+    Returns the curve and its region names. .npy files are mapped directly.
+    CSV and Parquet files are converted once to a .npy cache next to the
+    source, rebuilt when the source is newer or holds other columns than
+    `columns` (by default every numeric column).
+    """
+    if path.lower().endswith(".npy"):
+        curve = np.load(path, mmap_mode="r")
+        return curve, _regions(path, curve)
+
+    cache_path = path + ".npy"
+    columns = list(columns) if columns is not None else _default_columns(path)
+    stale = not os.path.exists(cache_path) or os.path.getmtime(cache_path) < os.path.getmtime(path)
+    if not stale:
+        stale = _regions(cache_path, np.empty((0, 0))) != columns
+    if stale:
+        build_cache(path, cache_path, columns)
+    curve = np.load(cache_path, mmap_mode="r")
+    return curve, _regions(cache_path, curve)
+
+
+def _as_2d(curve):
+    # (hours,) curves apply to every region
+    return curve[:, None] if curve.ndim == 1 else curve
+
+
+def evaluate_hourly(
+    curves,
+    inputs=None,
+    scenarios=SCENARIOS,
+    regions=None,
+    profit_path=None,
+    chunk_hours=744,
+    hours_per_year=HOURS_PER_YEAR,
+):
+    """Evaluate every scenario hour by hour against price curves.
+
+    `curves` maps input names to arrays (typically from load_curve) of shape
+    (hours,) or (hours, regions); `inputs` holds the remaining scalar inputs.
+    Quantities are per hour and annualized CAPEX is spread over
+    `hours_per_year` hours. Curves are read `chunk_hours` at a time, so only
+    one chunk is in memory at once.
+
+    Every input must be given, as a curve or a scalar: the app's defaults are
+    per day and would be wrong per hour. `regions` labels the curve columns,
+    typically the names returned by load_curve.
+
+    Returns the per-hour profit as an (hours, regions, scenarios) .npy memmap
+    at `profit_path`, or None when no path is given, and a DataFrame of
+    annual aggregates per region and scenario.
+    """
+    inputs = inputs or {}
+    unknown = (set(curves) | set(inputs)) - set(INPUTS)
+    if unknown:
+        raise ValueError(f"Unknown inputs: {sorted(unknown)}")
+    overlap = set(curves) & set(inputs)
+    if overlap:
+        raise ValueError(f"Inputs given both as curves and scalars: {sorted(overlap)}")
+    missing = set(INPUTS) - set(curves) - set(inputs)
+    if missing:
+        raise ValueError(f"Missing hourly inputs: {sorted(missing)}")
+
+    curves = {name: _as_2d(curve) for name, curve in curves.items()}
+    hours = {len(curve) for curve in curves.values()}
+    if len(hours) != 1:
+        raise ValueError(f"Price curves have different lengths: {sorted(hours)}")
+    n_hours = hours.pop()
+    n_regions = max(curve.shape[1] for curve in curves.values())
+    if any(curve.shape[1] not in (1, n_regions) for curve in curves.values()):
+        raise ValueError("Price curves have different numbers of regions")
+    regions = list(regions) if regions is not None else list(range(n_regions))
+    if len(regions) != n_regions:
+        raise ValueError(f"Got {len(regions)} region names for {n_regions} regions")
+    n_scenarios = len(scenarios)
+    n_years = -(-n_hours // hours_per_year)
+
+    hourly_profit = None
+    if profit_path is not None:
+        hourly_profit = np.lib.format.open_memmap(
+            profit_path, mode="w+", dtype=np.float64, shape=(n_hours, n_regions, n_scenarios)
+        )
+
+    totals = {
+        column: np.zeros((n_years, n_regions, n_scenarios))
+        for column in ("Revenue (€)", "Total Production Cost (€)", "Profit (€)")
+    }
+    profitable_hours = np.zeros((n_years, n_regions, n_scenarios), dtype=np.int64)
+
+    for start in range(0, n_hours, chunk_hours):
+        stop = min(start + chunk_hours, n_hours)
+        chunk_inputs = dict(inputs)
+        for name, curve in curves.items():
+            chunk_inputs[name] = np.broadcast_to(curve[start:stop], (stop - start, n_regions)).ravel()
+        results = evaluate_scenarios(chunk_inputs, scenarios, profit_frequency_annually=hours_per_year)
+        results = {column: results[column].reshape(stop - start, n_regions, n_scenarios) for column in totals}
+        if hourly_profit is not None:
+            hourly_profit[start:stop] = results["Profit (€)"]
+
+        # Split the chunk at year boundaries
+        for year in range(start // hours_per_year, (stop - 1) // hours_per_year + 1):
+            lo = max(start, year * hours_per_year) - start
+            hi = min(stop, (year + 1) * hours_per_year) - start
+            for column in totals:
+                totals[column][year] += results[column][lo:hi].sum(axis=0)
+            profitable_hours[year] += (results["Profit (€)"][lo:hi] > 0).sum(axis=0)
+
+    if hourly_profit is not None:
+        hourly_profit.flush()
+
+    index = pd.MultiIndex.from_product(
+        [range(n_years), regions, [scenario for scenario, _, _, _ in scenarios]],
+        names=["Year", "Region", "Scenario"],
+    )
+    annual = pd.DataFrame({column: values.ravel() for column, values in totals.items()}, index=index)
+    annual["Profitable Hours"] = profitable_hours.ravel()
+    return hourly_profit, annual.reset_index()
@@ -0,0 +1,181 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from engine import INPUTS, SCENARIOS, evaluate_scenarios
+
+DISTRIBUTIONS = ["uniform", "normal", "lognormal", "triangular"]
+
+
+def sample_inputs(distributions, size, rng):
+    """Draw `size` input vectors from `distributions`.
+
+    Each value is either a fixed number or a tuple such as ("uniform", low, high),
+    ("normal", mean, std), ("lognormal", mean, sigma) or
+    ("triangular", left, mode, right). Inputs are drawn in INPUTS order so a
+    given generator always produces the same samples.
+    """
+    unknown = set(distributions) - set(INPUTS)
+    if unknown:
+        raise ValueError(f"Unknown inputs: {sorted(unknown)}")
+
+    samples = {}
+    for name in INPUTS:
+        if name not in distributions:
+            continue
+        spec = distributions[name]
+        if not isinstance(spec, (tuple, list)):
+            samples[name] = np.full(size, spec, dtype=float)
+            continue
+        kind, *args = spec
+        if kind not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution {kind!r} for {name}, expected one of {DISTRIBUTIONS}")
+        samples[name] = getattr(rng, kind)(*args, size=size)
+    return samples
+
+
+def _edges(values, bins):
+    # Per-scenario bin layout fixed from the pilot sample, padded by 10% each side
+    finite = np.isfinite(values)
+    lo = np.where(finite, values, np.inf).min(axis=0)
+    hi = np.where(finite, values, -np.inf).max(axis=0)
+    lo = np.where(np.isfinite(lo), lo, 0.0)
+    hi = np.where(np.isfinite(hi), hi, 1.0)
+    pad = np.maximum((hi - lo) * 0.1, np.maximum(np.abs(lo), 1.0) * 1e-6)
+    lo, hi = lo - pad, hi + pad
+    return lo, (hi - lo) / bins
+
+
+def _histogram(values, lo, width, bins):
+    # Slot 0 is underflow, 1..bins the grid, bins + 1 overflow, bins + 2 infinite values
+    n_slots = bins + 3
+    idx = np.floor((values - lo) / width)
+    idx = np.clip(np.nan_to_num(idx, posinf=bins, neginf=-1), -1, bins).astype(np.int64) + 1
+    idx[np.isinf(values)] = bins + 2
+    idx += np.arange(values.shape[1]) * n_slots
+    return np.bincount(idx.ravel(), minlength=values.shape[1] * n_slots).reshape(values.shape[1], n_slots)
+
+
+def _summarize_chunk(values, lo, width, bins):
+    finite = np.isfinite(values)
+    masked = np.where(finite, values, 0.0)
+    return {
+        "counts": _histogram(values, lo, width, bins),
+        "negative": (values < 0).sum(axis=0),
+        "sum": masked.sum(axis=0),
+        "min": np.where(finite, values, np.inf).min(axis=0),
+        "max": np.where(finite, values, -np.inf).max(axis=0),
+    }
+
+
+def _merge(total, part):
+    if total is None:
+        return part
+    return {
+        "counts": total["counts"] + part["counts"],
+        "negative": total["negative"] + part["negative"],
+        "sum": total["sum"] + part["sum"],
+        "min": np.minimum(total["min"], part["min"]),
+        "max": np.maximum(total["max"], part["max"]),
+    }
+
+
+def _run_chunk(args):
+    distributions, size, seed_sequence, scenarios, layout, bins = args
+    rng = np.random.default_rng(seed_sequence)
+    results = evaluate_scenarios(sample_inputs(distributions, size, rng), scenarios)
+    return {
+        column: _summarize_chunk(results[column], lo, width, bins)
+        for column, (lo, width) in layout.items()
+    }
+
+
+def _quantiles(summary, lo, width, bins, quantiles):
+    # Linear interpolation inside the bin holding each rank; tails span [min, lo] and [hi, max]
+    counts = summary["counts"]
+    n = counts.sum(axis=1)
+    out = np.full((counts.shape[0], len(quantiles)), np.inf)
+    for s in range(counts.shape[0]):
+        left = np.concatenate(([summary["min"][s]], lo[s] + width[s] * np.arange(bins + 1)))
+        right = np.concatenate((lo[s] + width[s] * np.arange(bins + 1), [summary["max"][s]]))
+        cumulative = np.cumsum(counts[s, :-1])
+        for j, q in enumerate(quantiles):
+            rank = q * n[s]
+            if n[s] == 0 or rank > cumulative[-1]:
+                continue
+            slot = min(np.searchsorted(cumulative, rank), len(cumulative) - 1)
+            below = cumulative[slot - 1] if slot else 0
+            in_slot = counts[s, slot]
+            fraction = (rank - below) / in_slot if in_slot else 0.0
+            value = left[slot] + fraction * (right[slot] - left[slot])
+            out[s, j] = min(max(value, summary["min"][s]), summary["max"][s])
+    return out
+
+
+def run_monte_carlo(
+    distributions,
+    n_samples,
+    scenarios=SCENARIOS,
+    chunk_size=20000,
+    seed=0,
+    workers=None,
+    quantiles=(0.05, 0.5, 0.95),
+    bins=2048,
+):
+    """Evaluate `n_samples` draws of `distributions` against every scenario.
+
+    Samples are evaluated chunk by chunk and reduced into per-scenario
+    histograms, so memory stays proportional to chunk_size. Chunk i always
+    uses the i-th child of SeedSequence(seed), which makes a run reproducible
+    for a given seed and chunk_size regardless of the number of workers.
+    Quantiles are interpolated from `bins` histogram bins per scenario.
+    """
+    root = np.random.SeedSequence(seed)
+    n_chunks = -(-n_samples // chunk_size)
+    pilot_sequence, *chunk_sequences = root.spawn(n_chunks + 1)
+
+    # A pilot sample fixes the histogram layout so chunk summaries can be merged
+    pilot = evaluate_scenarios(
+        sample_inputs(distributions, min(n_samples, chunk_size), np.random.default_rng(pilot_sequence)),
+        scenarios,
+    )
+    layout = {column: _edges(pilot[column], bins) for column in ("Profit (€)", "Payback Period (days)")}
+
+    sizes = [min(chunk_size, n_samples - i * chunk_size) for i in range(n_chunks)]
+    tasks = [
+        (distributions, size, sequence, tuple(scenarios), layout, bins)
+        for size, sequence in zip(sizes, chunk_sequences)
+    ]
+
+    summary = {column: None for column in layout}
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or n_chunks == 1:
+        for part in map(_run_chunk, tasks):
+            summary = {column: _merge(summary[column], part[column]) for column in layout}
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for part in executor.map(_run_chunk, tasks):
+                summary = {column: _merge(summary[column], part[column]) for column in layout}
+
+    profit, payback = summary["Profit (€)"], summary["Payback Period (days)"]
+    profit_quantiles = _quantiles(profit, *layout["Profit (€)"], bins, quantiles)
+    payback_quantiles = _quantiles(payback, *layout["Payback Period (days)"], bins, quantiles)
+
+    # Every chunk holds one draw per sample, so the histogram totals are the sample count
+    n = profit["counts"].sum(axis=1)
+
+    table = {
+        "Scenario": [scenario for scenario, _, _, _ in scenarios],
+        "Mean Profit (€)": profit["sum"] / n,
+        "Min Profit (€)": profit["min"],
+        "Max Profit (€)": profit["max"],
+    }
+    for j, q in enumerate(quantiles):
+        table[f"Profit P{q * 100:g} (€)"] = profit_quantiles[:, j]
+    # A loss is strictly negative profit; zero profit still has an infinite payback
+    table["Probability of Loss"] = profit["negative"] / n
+    for j, q in enumerate(quantiles):
+        table[f"Payback P{q * 100:g} (days)"] = payback_quantiles[:, j]
+    return pd.DataFrame(table)
@@ -0,0 +1,27 @@
+import io
+
+import pandas as pd
+
+
+def profit_figure(scenarios, profits):
+    # Matplotlib is imported here so headless callers that never plot don't pay for it.
+    # The Figure is built directly rather than through pyplot, so it is not registered
+    # in pyplot's global figure manager and is freed once unreferenced.
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(15, 8))
+    ax = fig.subplots()
+    pd.DataFrame({"Scenario": scenarios, "Profit (€)": profits}).plot(x='Scenario', y='Profit (€)', kind='bar', ax=ax, legend=False)
+    ax.set_xlabel("Scenario")
+    ax.set_ylabel("Profit (€)")
+    ax.set_title("Profit per Scenario")
+    ax.tick_params(axis="x", labelrotation=90)
+    fig.tight_layout()
+    return fig
+
+
+def profit_png(scenarios, profits):
+    """The profit chart rendered to PNG bytes, safe to cache and share between sessions."""
+    buffer = io.BytesIO()
+    profit_figure(scenarios, profits).savefig(buffer, format="png")
+    return buffer.getvalue()
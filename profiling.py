@@ -0,0 +1,36 @@
+import json
+import time
+from contextlib import contextmanager
+
+
+class Profiler:
+    """Per-stage wall-clock timers and counters, a no-op unless enabled."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.timings = {}
+        self.counters = {}
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - started
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def as_dict(self):
+        return {
+            "timings_ms": {name: seconds * 1000 for name, seconds in self.timings.items()},
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), indent=2)
@@ -1,67 +1,189 @@
-    # Define scenarios
-    scenarios = [
-                 
-        ("E", [electricity_price, electrolysis_ratio, 0, 0, fractionation_ratio, 0, 0, 0, 0, 0], "Supplying only electricity"),
-        ("W", [0, 0, 0, 0, 0, 0, 0, water_price, water_quantity, 0], "Supplying only water for electrolysis"),
-        ("EP", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, 0, 0, water_price, water_quantity, 0], "Producing hydrogen through electrolysis"),
-        ("H", [0, 0, hydrogen_price, hydrogen_quantity, 0, 0, 0, 0, 0, 0], "Handling and selling hydrogen"),
-        ("CO2", [0, 0, 0, 0, 0, co2_price, co2_quantity, 0, 0, 0], "Acquiring and selling CO2"),
-        ("C", [electricity_price, electrolysis_ratio, 0, 0, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Converting hydrogen and CO2 to eSAF"),
-        ("E + W", [electricity_price, 0, 0, 0, 0, 0, 0, water_price, water_quantity, 0], "Supplying electricity and water for electrolysis"),
-        ("E + EP", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, 0, 0, water_price, water_quantity, 0], "Supplying electricity and producing hydrogen"),
-        ("E + H", [electricity_price, 0, hydrogen_price, hydrogen_quantity, 0, 0, 0, 0, 0, 0], "Supplying electricity and handling hydrogen"),
-        ("E + CO2", [electricity_price, 0, 0, 0, 0, co2_price, co2_quantity, 0, 0, 0], "Supplying electricity and acquiring CO2"),
-        ("E + C", [electricity_price, electrolysis_ratio, 0, 0, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity and converting to eSAF"),
-        ("W + EP", [0, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, 0, 0, water_price, water_quantity, 0], "Supplying water and producing hydrogen"),
-        ("W + H", [0, 0, hydrogen_price, hydrogen_quantity, 0, 0, 0, 0, 0, 0], "Supplying water and handling hydrogen"),
-        ("W + CO2", [0, electrolysis_ratio, 0, 0, 0, co2_price, co2_quantity, water_price, water_quantity, 0], "Supplying water and acquiring CO2"),
-        ("W + C", [0, electrolysis_ratio, 0, 0, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying water and converting to eSAF"),
-        ("EP + H", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, 0, 0, water_price, water_quantity, 0], "Producing and handling hydrogen"),
-        ("EP + CO2", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, co2_price, co2_quantity, water_price, water_quantity, 0], "Producing hydrogen and acquiring CO2"),
-        ("EP + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Producing hydrogen and converting to eSAF"),
-        ("H + CO2", [0, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, co2_price, co2_quantity, water_price, water_quantity, 0], "Handling hydrogen and acquiring CO2"),
-        ("H + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Handling hydrogen and converting to eSAF"),
-        ("CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Acquiring CO2 and converting to eSAF"),
-        ("E + W + EP", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, 0, 0, water_price, water_quantity, 0], "Supplying electricity, water, and producing hydrogen"),
-        ("E + W + H", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, 0, 0, 0, 0, 0], "Supplying electricity, water, and handling hydrogen"),
-        ("E + W + CO2", [electricity_price, electrolysis_ratio, 0, 0, 0, co2_price, co2_quantity, water_price, water_quantity, 0], "Supplying electricity, water, and acquiring CO2"),
-        ("E + W + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, water, and converting to eSAF"),
-        ("E + EP + H", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, co2_price, co2_quantity, water_price, water_quantity, 0], "Supplying electricity, producing hydrogen, and handling hydrogen"),
-        ("E + EP + CO2", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, producing hydrogen, and acquiring CO2"),
-        ("E + EP + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, producing hydrogen, and converting to eSAF"),
-        ("E + H + CO2", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, co2_price, co2_quantity, water_price, water_quantity, 0], "Supplying electricity, handling hydrogen, and acquiring CO2"),
-        ("E + H + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, handling hydrogen, and converting to eSAF"),
-        ("E + CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, acquiring CO2, and converting to eSAF"),
-        ("W + EP + H", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, co2_price, co2_quantity, water_price, water_quantity, 0], "Supplying water, producing hydrogen, and handling hydrogen"),
-        ("W + EP + CO2", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying water, producing hydrogen, and acquiring CO2"),
-        ("W + EP + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying water, producing hydrogen, and converting to eSAF"),
-        ("W + H + CO2", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, co2_price, co2_quantity, water_price, water_quantity, 0], "Supplying water, handling hydrogen, and acquiring CO2"),
-        ("W + H + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying water, handling hydrogen, and converting to eSAF"),
-        ("W + CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying water, acquiring CO2, and converting to eSAF"),
-        ("EP + H + CO2", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, 0], "Producing hydrogen, handling hydrogen, and acquiring CO2"),
-        ("EP + H + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Producing hydrogen, handling hydrogen, and converting to eSAF"),
-        ("EP + CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Producing hydrogen, acquiring CO2, and converting to eSAF"),
-        ("H + CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Handling hydrogen, acquiring CO2, and converting to eSAF"),
-        ("E + W + EP + H", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, co2_price, co2_quantity, water_price, water_quantity, 0], "Supplying electricity, water, producing hydrogen, and handling hydrogen"),
-        ("E + W + EP + CO2", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, water, producing hydrogen, and acquiring CO2"),
-        ("E + W + EP + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, water, producing hydrogen, and converting to eSAF"),
-        ("E + W + H + CO2", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, co2_price, co2_quantity, water_price, water_quantity, 0], "Supplying electricity, water, handling hydrogen, and acquiring CO2"),
-        ("E + W + H + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, water, handling hydrogen, and converting to eSAF"),
-        ("E + W + CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, water, acquiring CO2, and converting to eSAF"),
-        ("E + EP + H + CO2", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, 0], "Supplying electricity, producing hydrogen, handling hydrogen, and acquiring CO2"),
-        ("E + EP + H + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, producing hydrogen, handling hydrogen, and converting to eSAF"),
-        ("E + EP + CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, producing hydrogen, acquiring CO2, and converting to eSAF"),
-        ("E + H + CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, handling hydrogen, acquiring CO2, and converting to eSAF"),
-        ("W + EP + H + CO2", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, co2_price, co2_quantity, water_price, water_quantity, 0], "Supplying water, producing hydrogen, handling hydrogen, and acquiring CO2"),
-        ("W + EP + H + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying water, producing hydrogen, handling hydrogen, and converting to eSAF"),
-        ("W + EP + CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying water, producing hydrogen, acquiring CO2, and converting to eSAF"),
-        ("W + H + CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying water, handling hydrogen, acquiring CO2, and converting to eSAF"),
-        ("EP + H + CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Producing hydrogen, handling hydrogen, acquiring CO2, and converting to eSAF"),
-        ("E + W + EP + H + CO2", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, 0, co2_price, co2_quantity, water_price, water_quantity, 0], "Supplying electricity, water, producing hydrogen, handling hydrogen, and acquiring CO2"),
-        ("E + W + EP + H + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, water, producing hydrogen, handling hydrogen, and converting to eSAF"),
-        ("E + W + EP + CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, water, producing hydrogen, acquiring CO2, and converting to eSAF"),
-        ("E + W + H + CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, water, handling hydrogen, acquiring CO2, and converting to eSAF"),
-        ("E + EP + H + CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, producing hydrogen, handling hydrogen, acquiring CO2, and converting to eSAF"),
-        ("W + EP + H + CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying water, producing hydrogen, handling hydrogen, acquiring CO2, and converting to eSAF"),
-        ("E + W + EP + H + CO2 + C", [electricity_price, electrolysis_ratio, hydrogen_price, hydrogen_quantity, fractionation_ratio, co2_price, co2_quantity, water_price, water_quantity, esaf_selling_price], "Supplying electricity, water, producing hydrogen, handling hydrogen, acquiring CO2, and converting to eSAF")
-    ]
+from itertools import combinations
+
+import numpy as np
+
+import engine
+from engine import CAPEX_ITEMS, LINES, PARAMETERS, TERMS
+
+# Value-chain components in enumeration order. Each one lists the parameters
+# and CAPEX items it brings into a scenario, the components of which at least
+# one must also be present (requires) and the components that make it
+# redundant when present (redundant_with).
+COMPONENTS = {}
+
+
+def register_component(
+    name,
+    description,
+    parameters,
+    capex=(),
+    requires=(),
+    redundant_with=(),
+    coefficients=None,
+):
+    """Add a value-chain component to the scenario generator.
+
+    `coefficients` maps LINES entries to {term: multiplier} dicts, where terms
+    are engine.TERMS entries, i.e. (price, quantity) pairs such as
+    ("electricity_price", "fractionation_ratio"); they are added to the
+    engine's cost and revenue lines whenever the component is part of a
+    scenario. Built-in components are already known to the engine.
+    """
+    if name in COMPONENTS:
+        raise ValueError(f"Component {name} is already registered")
+    unknown = set(parameters) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown parameters for component {name}: {sorted(unknown)}")
+    unknown = set(capex) - set(CAPEX_ITEMS)
+    if unknown:
+        raise ValueError(f"Unknown CAPEX items for component {name}: {sorted(unknown)}")
+    unknown = (set(requires) | set(redundant_with)) - set(COMPONENTS)
+    if unknown:
+        raise ValueError(f"Component {name} refers to unregistered components: {sorted(unknown)}")
+
+    if name not in engine.COMPONENTS:
+        extra = np.zeros((len(LINES), len(TERMS)))
+        for line, multipliers in (coefficients or {}).items():
+            if line not in LINES:
+                raise ValueError(f"Unknown line for component {name}: {line!r}")
+            for term, multiplier in multipliers.items():
+                # Keyed by the whole pair: a price such as electricity_price enters several terms
+                if tuple(term) not in TERMS:
+                    raise ValueError(f"Unknown term for component {name}: {term!r}, expected one of {TERMS}")
+                extra[LINES.index(line), TERMS.index(tuple(term))] = multiplier
+        engine.EXTRA_COMPONENTS[name] = extra
+        engine.compile_scenarios.cache_clear()
+
+    COMPONENTS[name] = {
+        "description": description,
+        "parameters": frozenset(parameters),
+        "capex": tuple(item for item in CAPEX_ITEMS if item in capex),
+        "requires": tuple(requires),
+        "redundant_with": tuple(redundant_with),
+    }
+
+
+register_component(
+    "E",
+    "supplying electricity",
+    ["electricity_price", "electrolysis_ratio", "fractionation_ratio"],
+)
+register_component(
+    "W",
+    "supplying water",
+    ["water_price", "water_quantity"],
+)
+register_component(
+    "EP",
+    "producing hydrogen",
+    ["electricity_price", "electrolysis_ratio", "hydrogen_price", "hydrogen_quantity", "water_price", "water_quantity"],
+    capex=["electrolysis", "hydrogen_storage"],
+)
+# Handling bought-in hydrogen adds nothing once it is produced on site
+register_component(
+    "H",
+    "handling hydrogen",
+    ["hydrogen_price", "hydrogen_quantity"],
+    capex=["hydrogen_storage"],
+    redundant_with=["EP"],
+)
+register_component(
+    "CO2",
+    "acquiring CO2",
+    ["co2_price", "co2_quantity"],
+    capex=["co2_capture"],
+)
+# Conversion to eSAF needs a hydrogen source
+register_component(
+    "C",
+    "converting to eSAF",
+    [
+        "electricity_price",
+        "fractionation_ratio",
+        "hydrogen_price",
+        "hydrogen_quantity",
+        "co2_price",
+        "co2_quantity",
+        "esaf_selling_price",
+    ],
+    capex=["esaf_production"],
+    requires=["EP", "H"],
+)
+
+
+def _rule_masks(names):
+    bits = {name: 1 << i for i, name in enumerate(names)}
+    requires = []
+    redundant = []
+    for name in names:
+        component = COMPONENTS[name]
+        if component["requires"]:
+            requires.append((bits[name], sum(bits[other] for other in component["requires"])))
+        if component["redundant_with"]:
+            redundant.append((bits[name], sum(bits[other] for other in component["redundant_with"])))
+    return requires, redundant
+
+
+def is_feasible(bitmask, names=None):
+    """False if the component subset misses a requirement or holds a redundant component."""
+    names = list(names or COMPONENTS)
+    requires, redundant = _rule_masks(names)
+    return _feasible(bitmask, requires, redundant)
+
+
+def _feasible(bitmask, requires, redundant):
+    for bit, needed in requires:
+        if bitmask & bit and not bitmask & needed:
+            return False
+    for bit, dominating in redundant:
+        if bitmask & bit and bitmask & dominating:
+            return False
+    return True
+
+
+def iter_bitmasks(names=None, max_size=None, prune=True):
+    """Lazily yield component subsets as bitmasks over `names`, smallest first."""
+    names = list(names or COMPONENTS)
+    requires, redundant = _rule_masks(names)
+    for size in range(1, (max_size or len(names)) + 1):
+        for indices in combinations(range(len(names)), size):
+            bitmask = sum(1 << i for i in indices)
+            if not prune or _feasible(bitmask, requires, redundant):
+                yield bitmask
+
+
+def _describe(phrases):
+    if len(phrases) == 1:
+        text = phrases[0]
+    elif len(phrases) == 2:
+        text = f"{phrases[0]} and {phrases[1]}"
+    else:
+        text = ", ".join(phrases[:-1]) + ", and " + phrases[-1]
+    return text[0].upper() + text[1:]
+
+
+def build_scenario(bitmask, names=None):
+    """Scenario row in the engine.SCENARIOS layout for a component bitmask."""
+    names = list(names or COMPONENTS)
+    members = [name for i, name in enumerate(names) if bitmask >> i & 1]
+    parameters = set().union(*(COMPONENTS[name]["parameters"] for name in members))
+    capex = set().union(*(COMPONENTS[name]["capex"] for name in members))
+    return (
+        " + ".join(members),
+        tuple(int(parameter in parameters) for parameter in PARAMETERS),
+        _describe([COMPONENTS[name]["description"] for name in members]),
+        tuple(item for item in CAPEX_ITEMS if item in capex),
+    )
+
+
+def generate_scenarios(names=None, max_size=None, prune=True):
+    """Lazily yield scenario rows for every (feasible) combination of components.
+
+    The rows can be passed to engine.evaluate_scenarios; with prune=True
+    combinations that break a component's requires or redundant_with rule
+    are skipped before any row is built.
+    """
+    names = list(names or COMPONENTS)
+    for bitmask in iter_bitmasks(names, max_size, prune):
+        yield build_scenario(bitmask, names)
+
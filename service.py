@@ -0,0 +1,184 @@
+"""Local HTTP/JSON valuation service.
+
+    python service.py --port 8765
+
+POST /evaluate with {"inputs": {"electricity_price": 60, ...}} returns the
+results table for that input set as {"results": [{column: value}, ...]}, with
+infinite payback periods as null. Missing inputs take the app's defaults.
+GET /stats reports request latency percentiles, batching and cache counters.
+
+Requests arriving within `window_ms` of each other are evaluated together in
+one engine call, and responses are served from an LRU cache keyed by the
+normalized inputs. Only the standard library, numpy and pandas are used.
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+from caching import LRUCache, normalize_inputs
+from engine import COLUMNS, INPUTS, SCENARIOS, evaluate_scenarios
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+class ValuationService:
+    def __init__(self, window_ms=2.0, max_batch=512, cache_size=4096, scenarios=SCENARIOS, latency_samples=10000):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.scenarios = tuple(scenarios)
+        self.cache = LRUCache(cache_size)
+        self.latencies = deque(maxlen=latency_samples)
+        self.requests = 0
+        self.batches = 0
+        self.batched_inputs = 0
+        self._pending = {}
+        self._flush_handle = None
+
+    async def evaluate(self, inputs):
+        """Serialized results for one input set, batched with concurrent callers."""
+        key = tuple(normalize_inputs(inputs)[name] for name in INPUTS)
+        body = self.cache.get(key)
+        if body is not None:
+            return body
+
+        # Identical inputs already waiting for the next batch share its result
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        keys = list(pending)
+        columns = np.array(keys).T
+        try:
+            results = evaluate_scenarios(dict(zip(INPUTS, columns)), self.scenarios)
+        except Exception as error:
+            for future in pending.values():
+                future.set_exception(error)
+            return
+        self.batches += 1
+        self.batched_inputs += len(keys)
+
+        for row, key in enumerate(keys):
+            body = json.dumps({"results": self._rows(results, row)}).encode()
+            self.cache.put(key, body)
+            pending[key].set_result(body)
+
+    def _rows(self, results, row):
+        rows = []
+        for s in range(len(self.scenarios)):
+            record = {"Scenario": results["Scenario"][s], "Description": results["Description"][s]}
+            for column in COLUMNS[2:]:
+                value = float(results[column][row, s])
+                record[column] = value if math.isfinite(value) else None
+            rows.append(record)
+        return rows
+
+    def stats(self):
+        latencies = np.array(self.latencies) * 1000
+        percentiles = {}
+        if len(latencies):
+            for q in (50, 90, 99, 99.9):
+                percentiles[f"p{q:g}"] = float(np.percentile(latencies, q))
+        return {
+            "requests": self.requests,
+            "latency_ms": percentiles,
+            "batches": self.batches,
+            "mean_batch_size": self.batched_inputs / self.batches if self.batches else 0.0,
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "cache_entries": len(self.cache),
+        }
+
+    async def route(self, method, path, body):
+        if path == "/evaluate":
+            if method != "POST":
+                return 405, json.dumps({"error": "use POST"}).encode()
+            started = time.perf_counter()
+            try:
+                request = json.loads(body or b"{}")
+                payload = await self.evaluate(request.get("inputs", {}))
+            except (ValueError, TypeError, AttributeError) as error:
+                return 400, json.dumps({"error": str(error)}).encode()
+            self.requests += 1
+            self.latencies.append(time.perf_counter() - started)
+            return 200, payload
+        if path == "/stats":
+            return 200, json.dumps(self.stats()).encode()
+        if path == "/health":
+            return 200, b'{"status": "ok"}'
+        return 404, json.dumps({"error": f"unknown path {path}"}).encode()
+
+    async def handle(self, reader, writer):
+        # Minimal HTTP/1.1 with keep-alive, enough for local JSON clients
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self.route(method, path.split("?")[0], body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"{version} {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve eSAF scenario valuations over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--window-ms", type=float, default=2.0, help="how long to collect requests into one batch")
+    parser.add_argument("--max-batch", type=int, default=512, help="evaluate immediately once this many are waiting")
+    parser.add_argument("--cache-size", type=int, default=4096, help="cached responses kept")
+    args = parser.parse_args(argv)
+
+    service = ValuationService(args.window_ms, args.max_batch, args.cache_size)
+    print(f"Serving on http://{args.host}:{args.port}")
+    asyncio.run(service.serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch import ResultWriter, main, run
+from engine import SCENARIOS, evaluate_scenarios
+
+
+def _inputs(path):
+    frame = pd.DataFrame(
+        {
+            "case": ["low", "mid", "high", "peak"],
+            "note": ["first", None, None, None],
+            "electricity_price": [20.0, 50.0, 80.0, 120.0],
+        }
+    )
+    frame.to_csv(path, index=False)
+    return frame
+
+
+def test_results_match_engine_and_keep_pass_through_columns(tmp_path):
+    frame = _inputs(tmp_path / "inputs.csv")
+    summary = run(str(tmp_path / "inputs.csv"), str(tmp_path / "results.csv"), chunk_size=3)
+    assert summary["inputs"] == 4
+    assert summary["outputs"] == 4 * len(SCENARIOS)
+
+    results = pd.read_csv(tmp_path / "results.csv")
+    expected = evaluate_scenarios({"electricity_price": frame["electricity_price"].to_numpy()})
+    np.testing.assert_allclose(results["Profit (€)"], expected["Profit (€)"].ravel())
+    assert list(results["case"].unique()) == ["low", "mid", "high", "peak"]
+    assert list(results["Input Row"].unique()) == [0, 1, 2, 3]
+
+
+def test_parquet_schema_is_stable_when_chunk_dtypes_change(tmp_path):
+    pytest.importorskip("pyarrow")
+    _inputs(tmp_path / "inputs.csv")
+    # "note" reads as text in the first chunk and as all-missing floats afterwards
+    run(str(tmp_path / "inputs.csv"), str(tmp_path / "results.parquet"), chunk_size=1)
+
+    results = pd.read_parquet(tmp_path / "results.parquet")
+    assert len(results) == 4 * len(SCENARIOS)
+    assert results["note"].iloc[0] == "first"
+    assert results["note"].iloc[len(SCENARIOS):].isna().all()
+
+
+def test_missing_pyarrow_raises_a_clear_error(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(ImportError, match="pip install pyarrow"):
+        ResultWriter(str(tmp_path / "results.parquet"))
+
+
+def test_timings_include_startup(tmp_path, capsys):
+    _inputs(tmp_path / "inputs.csv")
+    main([str(tmp_path / "inputs.csv"), str(tmp_path / "results.csv"), "--timings"])
+    report = dict(field.split("=") for field in capsys.readouterr().err.split())
+    assert report["inputs"] == "4"
+    if report["startup"] != "n/a":
+        assert 0 < float(report["startup"].rstrip("s")) <= float(report["total"].rstrip("s"))
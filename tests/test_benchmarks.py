@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from benchmarks import compare, main
+
+
+def test_compare_flags_cases_slower_than_the_threshold():
+    results = {"fast": {"median_s": 1.0}, "slow": {"median_s": 2.0}, "new": {"median_s": 5.0}, "gone": {"skipped": "x"}}
+    baseline = {"fast": {"median_s": 1.0}, "slow": {"median_s": 1.0}, "gone": {"median_s": 1.0}}
+    assert compare(results, baseline, 1.25) == {"slow": 2.0}
+
+
+def test_save_writes_a_baseline(tmp_path):
+    path = tmp_path / "baseline.json"
+    main(["--only", "single evaluation", "--repeat", "1", "--save", "--baseline", str(path)])
+    assert "median_s" in json.loads(path.read_text())["results"]["single evaluation"]
+
+
+def test_save_keeps_cases_that_were_not_run(tmp_path):
+    path = tmp_path / "baseline.json"
+    other = {"median_s": 1.0, "min_s": 1.0, "repeat": 1}
+    path.write_text(json.dumps({"results": {"sweep": other}}))
+
+    main(["--only", "single evaluation", "--repeat", "1", "--save", "--baseline", str(path)])
+    results = json.loads(path.read_text())["results"]
+    assert results["sweep"] == other
+    assert "median_s" in results["single evaluation"]
+
+
+def test_save_refuses_to_overwrite_the_baseline_after_a_regression(tmp_path):
+    path = tmp_path / "baseline.json"
+    baseline = {"results": {"single evaluation": {"median_s": 1e-12, "min_s": 1e-12, "repeat": 1}}}
+    path.write_text(json.dumps(baseline))
+
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--only", "single evaluation", "--repeat", "1", "--save", "--baseline", str(path)])
+    assert exit_info.value.code == 1
+    assert json.loads(path.read_text()) == baseline
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from breakeven import LINEAR_INPUTS, solve_thresholds, thresholds_frame
+from engine import SCENARIOS, compile_scenarios, evaluate_scenarios
+
+INPUT_SETS = {"electricity_price": np.array([30.0, 50.0, 90.0]), "co2_price": np.array([200.0, 500.0, 800.0])}
+
+
+def _plugged_in(name, values, scenario):
+    # Results of one scenario with `name` set to each input vector's threshold, where one was found
+    found = np.isfinite(values)
+    inputs = {input_name: column[found] for input_name, column in INPUT_SETS.items()}
+    return evaluate_scenarios({**inputs, name: values[found]}, [scenario])
+
+
+@pytest.mark.parametrize("name", LINEAR_INPUTS)
+def test_breakeven_values_give_zero_profit(name):
+    solution = solve_thresholds(INPUT_SETS, [name])
+    breakeven = solution[name]["Breakeven"]
+    for s, scenario in enumerate(SCENARIOS):
+        results = _plugged_in(name, breakeven[:, s], scenario)
+        # Zero up to rounding in the terms that cancel
+        scale = results["Revenue (€)"][:, 0] + results["Total Production Cost (€)"][:, 0]
+        assert np.all(np.abs(results["Profit (€)"][:, 0]) <= 1e-9 * np.abs(scale) + 1e-9)
+
+
+@pytest.mark.parametrize("name", ["esaf_selling_price", "capex_electrolysis"])
+def test_target_payback_values_give_the_target(name):
+    target = 1000
+    solution = solve_thresholds(INPUT_SETS, [name], target_payback_days=target)
+    values = solution[name]["Target Payback"]
+    assert np.isfinite(values).any()
+    for s, scenario in enumerate(SCENARIOS):
+        payback = _plugged_in(name, values[:, s], scenario)["Payback Period (days)"][:, 0]
+        np.testing.assert_allclose(payback, target, rtol=1e-9)
+
+
+def test_useful_life_is_solved_in_one_engine_call():
+    target = 2000
+    misses = compile_scenarios.cache_info().misses
+    solution = solve_thresholds(INPUT_SETS, ["useful_life_years"], target_payback_days=target)
+    assert compile_scenarios.cache_info().misses - misses <= 1
+
+    breakeven = solution["useful_life_years"]["Breakeven"]
+    life = solution["useful_life_years"]["Target Payback"]
+    assert np.isfinite(breakeven).any() and np.isfinite(life).any()
+    for s, scenario in enumerate(SCENARIOS):
+        profit = _plugged_in("useful_life_years", breakeven[:, s], scenario)["Profit (€)"][:, 0]
+        np.testing.assert_allclose(profit, 0, atol=1e-6)
+        payback = _plugged_in("useful_life_years", life[:, s], scenario)["Payback Period (days)"][:, 0]
+        np.testing.assert_allclose(payback, target, rtol=1e-9)
+
+
+def test_thresholds_frame_has_a_row_per_scenario():
+    solution = solve_thresholds({}, ["water_price"])
+    frame = thresholds_frame(solution)
+    assert list(frame.columns) == ["Scenario", "water_price (Breakeven)"]
+    assert len(frame) == len(SCENARIOS)
+    # Scenarios without water do not depend on its price at all
+    assert frame["water_price (Breakeven)"].isna().any()
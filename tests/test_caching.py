@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from caching import IncrementalEvaluator, LRUCache, normalize_inputs
+from engine import COLUMNS, SCENARIOS, evaluate_scenarios, scenario_dependencies
+from plotting import profit_png
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_normalize_inputs_fills_defaults_and_rejects_unknown_names():
+    assert normalize_inputs({"useful_life_years": 10}) == normalize_inputs({"useful_life_years": 10.0})
+    with pytest.raises(ValueError, match="Unknown inputs"):
+        normalize_inputs({"electricity_cost": 50})
+
+
+def test_incremental_evaluation_matches_engine():
+    evaluator = IncrementalEvaluator()
+    for inputs in ({}, {"water_price": 2.0}, {"water_price": 2.0, "electricity_price": 80.0}):
+        results = evaluator.evaluate(inputs)
+        expected = evaluate_scenarios(inputs)
+        assert list(results["Scenario"]) == list(expected["Scenario"])
+        for column in COLUMNS[2:]:
+            np.testing.assert_array_equal(results[column], expected[column])
+
+
+def test_only_scenarios_reading_a_changed_input_are_recomputed():
+    evaluator = IncrementalEvaluator()
+    evaluator.evaluate({})
+    assert evaluator.recomputed == len(SCENARIOS)
+
+    evaluator.evaluate({"water_price": 2.0})
+    reads_water = sum("water_price" in names for names in scenario_dependencies(SCENARIOS))
+    assert 0 < evaluator.recomputed == reads_water < len(SCENARIOS)
+
+    evaluator.evaluate({})
+    assert evaluator.recomputed == 0
+
+
+def test_profit_png_leaves_no_pyplot_figures():
+    plt = pytest.importorskip("matplotlib.pyplot")
+    png = profit_png(("E", "W"), (1.0, -2.0))
+    assert png.startswith(b"\x89PNG")
+    assert plt.get_fignums() == []
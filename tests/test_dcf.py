@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from dcf import cash_flows, discounted_payback, evaluate_dcf, irr, npv
+from engine import SCENARIOS
+
+
+def _scalar_irr(flows, lo=-0.99, hi=10.0):
+    # Plain bisection on one cash flow series
+    def value(rate):
+        return sum(flow / (1 + rate) ** t for t, flow in enumerate(flows))
+
+    if np.sign(value(lo)) == np.sign(value(hi)):
+        return np.nan
+    for _ in range(200):
+        mid = (lo + hi) / 2
+        if np.sign(value(mid)) == np.sign(value(lo)):
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
+def test_npv_matches_direct_discounting():
+    rng = np.random.default_rng(0)
+    flows = rng.normal(size=(5, 12))
+    rates = rng.uniform(0, 0.2, size=5)
+    expected = [sum(f / (1 + r) ** t for t, f in enumerate(row)) for row, r in zip(flows, rates)]
+    np.testing.assert_allclose(npv(flows, rates), expected)
+
+
+def test_irr_matches_scalar_bisection():
+    rng = np.random.default_rng(1)
+    flows = np.concatenate([-rng.uniform(50, 150, size=(200, 1)), rng.uniform(-5, 30, size=(200, 15))], axis=1)
+    # Series that never recover have no IRR in the bracket
+    flows[:10, 1:] = -1.0
+
+    rates = irr(flows)
+    expected = np.array([_scalar_irr(row) for row in flows])
+    np.testing.assert_array_equal(np.isnan(rates), np.isnan(expected))
+    assert np.isnan(rates[:10]).all()
+    found = ~np.isnan(rates)
+    assert found.sum() > 100
+    np.testing.assert_allclose(rates[found], expected[found], atol=1e-8)
+
+
+def test_discounted_payback_interpolates_within_the_year():
+    flows = np.array([[-100.0, 60.0, 60.0, 60.0], [-100.0, 10.0, 10.0, 10.0]])
+    payback = discounted_payback(flows, np.zeros(2))
+    assert payback[0] == pytest.approx(1 + 40 / 60)
+    assert np.isinf(payback[1])
+
+
+def test_discounted_payback_waits_for_phased_capex():
+    flows = np.array([[0.0, -100.0, 60.0, 60.0], [0.0, -100.0, 10.0, 10.0]])
+    payback = discounted_payback(flows, np.zeros(2))
+    assert payback[0] == pytest.approx(2 + 40 / 60)
+    assert np.isinf(payback[1])
+
+    evaluation = evaluate_dcf({}, capex_phasing=(0.0, 1.0))
+    never = evaluation["NPV (€)"] < 0
+    assert never.any()
+    assert np.isinf(evaluation["Discounted Payback (years)"][never]).all()
+
+
+def test_cash_flows_carry_capex_in_year_zero_and_profit_afterwards():
+    inputs = {"useful_life_years": 10}
+    flows = cash_flows(inputs)
+    evaluation = evaluate_dcf(inputs, discount_rate=0.0)
+    assert flows.shape == (1, len(SCENARIOS), 11)
+    np.testing.assert_allclose(evaluation["NPV (€)"], flows.sum(axis=-1))
+    np.testing.assert_allclose(flows[..., 1:], flows[..., 1:2].repeat(10, axis=-1))
@@ -0,0 +1,62 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from engine import COLUMNS, DEFAULT_INPUTS, SCENARIOS, evaluate_scenarios, parse_scenario, results_frame
+
+# Per-scenario results of the original regex-based calculate_costs_and_revenue in
+# financial_model.main(), recorded with the scenario table it used
+with open(os.path.join(os.path.dirname(__file__), "fixtures", "legacy_results.json"), encoding="utf-8") as f:
+    LEGACY = json.load(f)
+
+LEGACY_SCENARIOS = tuple(
+    (name, tuple(mask), description, tuple(capex)) for name, mask, description, capex in LEGACY["scenarios"]
+)
+
+
+def test_app_table_is_the_legacy_table():
+    assert SCENARIOS == LEGACY_SCENARIOS
+
+
+@pytest.mark.parametrize("case", LEGACY["cases"], ids=lambda case: str(case["inputs"]["electricity_price"]))
+def test_matches_legacy_results(case):
+    results = evaluate_scenarios(case["inputs"], LEGACY_SCENARIOS)
+    for s, scenario in enumerate(results["Scenario"]):
+        for column, expected in case["results"][scenario].items():
+            assert results[column][0, s] == pytest.approx(expected, rel=1e-9, abs=1e-9), (scenario, column)
+
+
+def test_batch_rows_match_single_evaluations():
+    cases = LEGACY["cases"]
+    batch = evaluate_scenarios(
+        {name: np.array([case["inputs"][name] for case in cases]) for name in DEFAULT_INPUTS},
+        LEGACY_SCENARIOS,
+    )
+    for row, case in enumerate(cases):
+        single = evaluate_scenarios(case["inputs"], LEGACY_SCENARIOS)
+        for column in COLUMNS[2:]:
+            np.testing.assert_allclose(batch[column][row], single[column][0], rtol=1e-12)
+
+
+def test_zero_useful_life_keeps_capex_free_scenarios_finite():
+    results = evaluate_scenarios({"useful_life_years": 0}, LEGACY_SCENARIOS)
+    assert not np.isnan(results["Profit (€)"]).any()
+    assert not np.isnan(results["Payback Period (days)"]).any()
+    e = list(results["Scenario"]).index("E")
+    assert results["Profit (€)"][0, e] == pytest.approx(2750.0)
+
+
+def test_parse_scenario_matches_whole_components_only():
+    flags = parse_scenario("EP + CO2")
+    assert flags["EP"] and flags["CO2"]
+    assert not flags["E"] and not flags["C"]
+    with pytest.raises(ValueError):
+        parse_scenario("E + X")
+
+
+def test_results_frame_layout():
+    frame = results_frame(evaluate_scenarios({}, LEGACY_SCENARIOS))
+    assert list(frame.columns) == COLUMNS
+    assert len(frame) == len(LEGACY_SCENARIOS)
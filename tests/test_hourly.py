@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine import DEFAULT_INPUTS, evaluate_scenarios
+from hourly import build_cache, evaluate_hourly, load_curve
+
+# Per-hour quantities: one day's defaults spread over 24 hours
+HOURLY_INPUTS = {
+    name: value / 24 if name.endswith(("_ratio", "_quantity")) else value
+    for name, value in DEFAULT_INPUTS.items()
+}
+
+
+def _write_curve(path, hours=48):
+    prices = pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2024-01-01", periods=hours, freq="h").astype(str),
+            "north": np.linspace(20, 90, hours),
+            "south": np.linspace(90, 20, hours),
+        }
+    )
+    prices.to_csv(path, index=False)
+    return prices
+
+
+def test_csv_cache_skips_timestamps_and_keeps_region_names(tmp_path):
+    source = str(tmp_path / "prices.csv")
+    prices = _write_curve(source)
+
+    curve, regions = load_curve(source)
+    assert regions == ["north", "south"]
+    np.testing.assert_allclose(curve, prices[["north", "south"]].to_numpy())
+
+    curve, regions = load_curve(source, columns=["south"])
+    assert regions == ["south"]
+    assert curve.shape == (48, 1)
+
+    # Asking for the default columns again rebuilds the narrowed cache
+    curve, regions = load_curve(source)
+    assert regions == ["north", "south"]
+    assert curve.shape == (48, 2)
+
+
+def test_failed_cache_build_leaves_no_temporary_file(tmp_path):
+    source = str(tmp_path / "prices.csv")
+    _write_curve(source)
+    cache_path = source + ".npy"
+
+    with pytest.raises(ValueError):
+        build_cache(source, cache_path, columns=["timestamp"])
+    assert not os.path.exists(cache_path + ".tmp")
+    assert not os.path.exists(cache_path)
+
+
+def test_missing_inputs_are_rejected():
+    curves = {"electricity_price": np.full(24, 50.0)}
+    with pytest.raises(ValueError, match="Missing hourly inputs"):
+        evaluate_hourly(curves, {"water_price": 0.0})
+
+
+def test_annual_totals_match_direct_evaluation(tmp_path):
+    source = str(tmp_path / "prices.csv")
+    _write_curve(source)
+    curve, regions = load_curve(source)
+    inputs = {name: value for name, value in HOURLY_INPUTS.items() if name != "electricity_price"}
+
+    hourly_profit, annual = evaluate_hourly(
+        {"electricity_price": curve}, inputs, regions=regions, chunk_hours=10, hours_per_year=24
+    )
+    assert hourly_profit is None
+    assert list(annual["Region"].unique()) == ["north", "south"]
+
+    for r, region in enumerate(regions):
+        expected = evaluate_scenarios(
+            dict(inputs, electricity_price=np.asarray(curve[:24, r])), profit_frequency_annually=24
+        )
+        rows = annual[(annual["Year"] == 0) & (annual["Region"] == region)]
+        np.testing.assert_allclose(rows["Profit (€)"], expected["Profit (€)"].sum(axis=0))
+        np.testing.assert_array_equal(rows["Profitable Hours"], (expected["Profit (€)"] > 0).sum(axis=0))
+
+
+def test_per_hour_profit_is_written_to_a_memmap(tmp_path):
+    curve = np.linspace(20, 90, 30)
+    inputs = {name: value for name, value in HOURLY_INPUTS.items() if name != "electricity_price"}
+    profit_path = str(tmp_path / "profit.npy")
+
+    hourly_profit, annual = evaluate_hourly({"electricity_price": curve}, inputs, profit_path=profit_path)
+    expected = evaluate_scenarios(dict(inputs, electricity_price=curve), profit_frequency_annually=8760)
+    np.testing.assert_allclose(np.load(profit_path)[:, 0], expected["Profit (€)"])
+    np.testing.assert_allclose(annual["Profit (€)"], hourly_profit.sum(axis=0).ravel())
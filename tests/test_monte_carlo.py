@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from engine import evaluate_scenarios
+from monte_carlo import _edges, _merge, _summarize_chunk, run_monte_carlo, sample_inputs
+
+DISTRIBUTIONS = {
+    "electricity_price": ("normal", 50, 15),
+    "co2_price": ("uniform", 200, 800),
+    "esaf_selling_price": ("triangular", 2000, 2750, 3500),
+    "useful_life_years": ("uniform", 5, 20),
+}
+
+
+def _row(summary, scenario):
+    return summary[summary["Scenario"] == scenario].iloc[0]
+
+
+def test_fixed_inputs_are_broadcast_to_every_sample():
+    samples = sample_inputs({"electricity_price": 50.0}, 7, np.random.default_rng(0))
+    assert samples["electricity_price"].shape == (7,)
+
+    summary = run_monte_carlo({"electricity_price": 50.0}, 1000, chunk_size=300, workers=1)
+    expected = evaluate_scenarios({"electricity_price": 50.0})
+    np.testing.assert_allclose(summary["Mean Profit (€)"], expected["Profit (€)"][0])
+    assert _row(summary, "EP")["Probability of Loss"] == 1.0
+
+
+def test_zero_profit_is_not_a_loss():
+    summary = run_monte_carlo({}, 100, workers=1)
+    w = _row(summary, "W")
+    assert w["Mean Profit (€)"] == 0.0
+    assert w["Probability of Loss"] == 0.0
+    assert np.isinf(w["Payback P50 (days)"])
+
+
+def test_streaming_summary_matches_exact_statistics():
+    n_samples, chunk_size, seed = 20000, 5000, 3
+    summary = run_monte_carlo(DISTRIBUTIONS, n_samples, chunk_size=chunk_size, seed=seed, workers=1)
+
+    # Rebuild the exact samples from the documented seeding scheme
+    sequences = np.random.SeedSequence(seed).spawn(n_samples // chunk_size + 1)[1:]
+    profit = np.concatenate([
+        evaluate_scenarios(sample_inputs(DISTRIBUTIONS, chunk_size, np.random.default_rng(sequence)))["Profit (€)"]
+        for sequence in sequences
+    ])
+
+    np.testing.assert_allclose(summary["Mean Profit (€)"], profit.mean(axis=0), rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(summary["Probability of Loss"], (profit < 0).mean(axis=0))
+    span = profit.max(axis=0) - profit.min(axis=0)
+    for q in (0.05, 0.5, 0.95):
+        exact = np.quantile(profit, q, axis=0)
+        assert np.all(np.abs(summary[f"Profit P{q * 100:g} (€)"] - exact) <= span * 1e-3 + 1e-9)
+
+
+def test_merged_chunk_summaries_equal_one_summary_of_all_values():
+    rng = np.random.default_rng(5)
+    values = rng.normal(size=(3000, 4))
+    values[::97, 1] = np.inf
+    lo, width = _edges(values[:500], 64)
+
+    whole = _summarize_chunk(values, lo, width, 64)
+    merged = None
+    for chunk in np.array_split(values, 7):
+        merged = _merge(merged, _summarize_chunk(chunk, lo, width, 64))
+    for key in whole:
+        np.testing.assert_allclose(merged[key], whole[key])
+    assert merged["counts"].sum() == values.size
+    assert merged["counts"][1, -1] == np.isinf(values[:, 1]).sum()
+
+
+def test_results_do_not_depend_on_worker_count():
+    serial = run_monte_carlo(DISTRIBUTIONS, 4000, chunk_size=1000, seed=7, workers=1)
+    parallel = run_monte_carlo(DISTRIBUTIONS, 4000, chunk_size=1000, seed=7, workers=2)
+    assert serial.equals(parallel)
+
+
+def test_unknown_distribution_is_rejected():
+    with pytest.raises(ValueError):
+        sample_inputs({"electricity_price": ("poisson", 3)}, 10, np.random.default_rng(0))
@@ -0,0 +1,25 @@
+import json
+
+from profiling import Profiler
+
+
+def test_stages_accumulate_and_counters_add_up():
+    profiler = Profiler()
+    for _ in range(2):
+        with profiler.stage("evaluate"):
+            pass
+    profiler.count("recomputed", 3)
+    profiler.count("recomputed")
+
+    report = json.loads(profiler.to_json())
+    assert set(report["timings_ms"]) == {"evaluate"}
+    assert report["timings_ms"]["evaluate"] >= 0
+    assert report["counters"] == {"recomputed": 4}
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler(enabled=False)
+    with profiler.stage("evaluate"):
+        pass
+    profiler.count("recomputed")
+    assert profiler.as_dict() == {"timings_ms": {}, "counters": {}}
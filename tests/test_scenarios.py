@@ -0,0 +1,67 @@
+import pytest
+
+import engine
+import scenarios
+from engine import DEFAULT_INPUTS, PARAMETERS, SCENARIOS, evaluate_scenarios
+from scenarios import build_scenario, generate_scenarios, is_feasible, register_component
+
+
+@pytest.fixture
+def registry():
+    # Components registered by a test are removed again afterwards
+    before = dict(scenarios.COMPONENTS)
+    yield
+    for name in set(scenarios.COMPONENTS) - set(before):
+        del scenarios.COMPONENTS[name]
+        engine.EXTRA_COMPONENTS.pop(name, None)
+    engine.compile_scenarios.cache_clear()
+
+GENERATED = tuple(generate_scenarios())
+
+
+def test_generated_scenarios_are_opt_in():
+    assert GENERATED != SCENARIOS
+    assert evaluate_scenarios({})["Scenario"].tolist() == [name for name, _, _, _ in SCENARIOS]
+
+
+def test_rows_use_the_parameters_and_capex_of_their_components():
+    for name, mask, _, capex in GENERATED:
+        members = name.split(" + ")
+        parameters = set().union(*(scenarios.COMPONENTS[member]["parameters"] for member in members))
+        assert {parameter for parameter, used in zip(PARAMETERS, mask) if used} == parameters
+        assert set(capex) == set().union(*(scenarios.COMPONENTS[member]["capex"] for member in members))
+
+
+def test_infeasible_combinations_are_skipped():
+    names = [name for name, _, _, _ in GENERATED]
+    assert "C" not in names
+    assert "EP + H" not in names
+    assert "H + C" in names
+    assert not is_feasible(1 << 5)
+    assert len(names) == len(set(names))
+
+
+def test_coefficients_are_keyed_by_price_and_quantity(registry):
+    register_component(
+        "X",
+        "selling fractionation power",
+        ["electricity_price", "fractionation_ratio"],
+        coefficients={"Revenue (€)": {("electricity_price", "fractionation_ratio"): 1.0}},
+    )
+    names = ["E", "X"]
+    with_x = build_scenario(0b11, names)
+    without_x = build_scenario(0b01, names)
+    results = evaluate_scenarios({}, (without_x, with_x))
+
+    extra_revenue = results["Revenue (€)"][0, 1] - results["Revenue (€)"][0, 0]
+    expected = DEFAULT_INPUTS["electricity_price"] * DEFAULT_INPUTS["fractionation_ratio"]
+    assert extra_revenue == pytest.approx(expected)
+
+
+def test_register_component_rejects_bad_definitions(registry):
+    with pytest.raises(ValueError, match="already registered"):
+        register_component("E", "supplying electricity", ["electricity_price"])
+    with pytest.raises(ValueError, match="Unknown term"):
+        register_component("Y", "y", ["electricity_price"], coefficients={"Revenue (€)": {"electricity_price": 1.0}})
+    with pytest.raises(ValueError, match="Unknown line"):
+        register_component("Z", "z", ["electricity_price"], coefficients={"Revenue": {}})
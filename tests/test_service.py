@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from engine import evaluate_scenarios
+from service import ValuationService
+
+
+def _post(service, body):
+    status, payload = asyncio.run(service.route("POST", "/evaluate", body))
+    return status, json.loads(payload)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"{not json",
+        b"[1, 2]",
+        b'{"inputs": 5}',
+        b'{"inputs": {"electricity_cost": 50}}',
+        b'{"inputs": {"electricity_price": "cheap"}}',
+    ],
+)
+def test_bad_requests_get_400(body):
+    status, response = _post(ValuationService(), body)
+    assert status == 400
+    assert "error" in response
+
+
+def test_results_match_engine():
+    status, response = _post(ValuationService(), b'{"inputs": {"electricity_price": 80}}')
+    assert status == 200
+    expected = evaluate_scenarios({"electricity_price": 80})
+    assert [row["Scenario"] for row in response["results"]] == list(expected["Scenario"])
+    profit = [row["Profit (€)"] for row in response["results"]]
+    np.testing.assert_allclose(profit, expected["Profit (€)"][0])
+    # Infinite payback periods are sent as null
+    payback = expected["Payback Period (days)"][0]
+    assert [row["Payback Period (days)"] is None for row in response["results"]] == list(np.isinf(payback))
+
+
+def test_concurrent_requests_share_one_batch_and_repeats_hit_the_cache():
+    service = ValuationService(window_ms=50)
+
+    async def burst():
+        bodies = [json.dumps({"inputs": {"electricity_price": price}}).encode() for price in (40, 50, 60, 60)]
+        return await asyncio.gather(*(service.route("POST", "/evaluate", body) for body in bodies))
+
+    responses = asyncio.run(burst())
+    assert [status for status, _ in responses] == [200] * 4
+    assert responses[2][1] == responses[3][1]
+    assert service.batches == 1
+    assert service.batched_inputs == 3
+
+    assert _post(service, b'{"inputs": {"electricity_price": 40.0}}')[0] == 200
+    stats = service.stats()
+    assert service.batches == 1
+    assert stats["cache_hits"] == 1
+    assert stats["requests"] == 5
+
+
+def test_unknown_paths_and_methods():
+    service = ValuationService()
+    assert asyncio.run(service.route("GET", "/evaluate", b""))[0] == 405
+    assert asyncio.run(service.route("GET", "/missing", b""))[0] == 404
+    assert asyncio.run(service.route("GET", "/health", b""))[0] == 200
+
+
+def test_http_round_trip():
+    service = ValuationService()
+
+    async def exchange():
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            body = b'{"inputs": {}}'
+            writer.write(
+                b"POST /evaluate HTTP/1.1\r\nContent-Length: %d\r\nConnection: close\r\n\r\n" % len(body) + body
+            )
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+
+    head, _, payload = asyncio.run(exchange()).partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200 OK")
+    assert len(json.loads(payload)["results"]) == len(evaluate_scenarios({})["Scenario"])